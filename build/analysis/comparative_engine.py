@@ -0,0 +1,217 @@
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from utils.engines import shared_engine
+
+# Column groups reported by profile(); any numeric column can be queried by position()
+COLUMN_GROUPS = {
+    'age': ['18-24', '25-34', '35-44', '45-54', '55-64', '65-74', '75+'],
+    'employment': ['Employed / Self employed', 'Unemployed', 'Homemaker',
+                   'Studying', 'Retired', 'Not able to work'],
+    'education': ['Primary Education', 'Some High School', 'High School',
+                  "Associate's Degree", 'Vocational certification',
+                  "Bachelor's Degree", "Master's Degree", 'PhD or Doctorate'],
+    'wellbeing_categories': ['% Distressed', '% Struggling', '% Enduring',
+                             '% Managing', '% Succeeding', '% Thriving'],
+    'mhq_scores': ['Average MHQ Score', 'Average Cognition Score',
+                   'Average Adaptability & Resilence Score',
+                   'Average Drive & Motivation Score',
+                   'Average Mood & Outlook Score', 'Average Social Self Score',
+                   'Average Mind-Body Connection Score'],
+    'happiness': ['Life Ladder', 'Log GDP per capita', 'Healthy life expectancy at birth'],
+    'cultural': ['Social support', 'Freedom to make life choices', 'Generosity',
+                 'Perceptions of corruption', 'Positive affect', 'Negative affect'],
+    'music': ['tempo', 'energy', 'valence', 'danceability', 'loudness',
+              'speechiness', 'acousticness', 'instrumentalness', 'liveness']
+}
+
+# Per-country measures, then distribution statistics of the global and regional populations
+MEASURES = ['value', 'global_percentile', 'region_percentile', 'global_zscore', 'region_zscore']
+STATS = ['count', 'mean', 'std', 'min', 'q25', 'median', 'q75', 'max']
+
+class ComparativeEngine:
+    """Positions every country against the global and regional distributions.
+
+    Percentile ranks, z-scores and distribution statistics are computed for
+    all countries and all numeric columns at once, with one sort per column,
+    on first use. Percentiles match
+    stats.percentileofscore(kind='rank') over the population's present values.
+    """
+
+    def __init__(self, df: pd.DataFrame, id_col: str = 'Country', group_col: str = 'region'):
+        self.df = df
+        self.id_col = id_col
+        self.group_col = group_col
+        self.columns = df.select_dtypes('number').columns.tolist()
+        self._tables: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    @property
+    def tables(self) -> Dict:
+        """Measure and statistic tables, computed on first access"""
+        with self._lock:
+            if self._tables is None:
+                self._tables = self._compute()
+            return self._tables
+
+    def __contains__(self, country: str) -> bool:
+        return country in self.tables['rows']
+
+    def region(self, country: str) -> Optional[str]:
+        """The region a country is compared within"""
+        return self.tables['regions'][country]
+
+    def table(self, measure: str) -> pd.DataFrame:
+        """One measure for every country, indexed by country and columned by column"""
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure: {measure}")
+        tables = self.tables
+        return pd.DataFrame(
+            tables[measure][tables['rows'].to_numpy()],
+            index=tables['rows'].index, columns=self.columns
+        )
+
+    def position(self, country: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """A country's measures and both populations' statistics, indexed by column.
+
+        Columns are MEASURES followed by global_<stat> and region_<stat> for STATS.
+        """
+        tables = self.tables
+        row = tables['rows'][country]
+        columns = [col for col in dict.fromkeys(columns or self.columns) if col in self.columns]
+        positions = [self.columns.index(col) for col in columns]
+
+        result = pd.DataFrame(
+            {measure: tables[measure][row, positions] for measure in MEASURES}, index=columns
+        )
+        region_stats = tables['region_stats'].get(tables['regions'][country])
+        if region_stats is None:
+            region_stats = pd.DataFrame(np.nan, index=self.columns, columns=STATS)
+        return pd.concat([
+            result,
+            tables['global_stats'].loc[columns].add_prefix('global_'),
+            region_stats.loc[columns].add_prefix('region_')
+        ], axis=1)
+
+    def profile(self, country: str, groups: Optional[List[str]] = None) -> Dict:
+        """JSON-ready position of a country for each column group"""
+        unknown = [group for group in groups or [] if group not in COLUMN_GROUPS]
+        if unknown:
+            raise ValueError(f"Unknown column group(s): {unknown}")
+
+        position = self.position(country)
+        profile = {}
+        for group in groups or COLUMN_GROUPS:
+            profile[group] = {
+                str(col): {
+                    stat: None if pd.isna(value) else
+                          int(value) if stat.endswith('count') else float(value)
+                    for stat, value in position.loc[col].items()
+                }
+                for col in COLUMN_GROUPS[group] if col in position.index
+            }
+        region = self.region(country)
+        return {'country': country, 'region': None if pd.isna(region) else region,
+                'groups': profile}
+
+    def clear(self) -> None:
+        """Drop the computed tables, e.g. after the underlying data changes"""
+        with self._lock:
+            self._tables = None
+
+    def _compute(self) -> Dict:
+        values = self.df[self.columns].to_numpy(dtype=float)
+        codes, regions = pd.factorize(self.df[self.group_col])
+
+        # Reduce each region frame directly so statistics match Series methods exactly
+        frame = self.df[self.columns]
+        global_stats = _describe(frame)
+        region_stats = {
+            region: _describe(frame.iloc[rows])
+            for region, rows in self.df.groupby(self.group_col, sort=False).indices.items()
+        }
+
+        # Region statistics per row; rows without a region index the trailing NaN row
+        missing = np.full(len(self.columns), np.nan)
+        region_mean = np.vstack([region_stats[region]['mean'] for region in regions] + [missing])[codes]
+        region_std = np.vstack([region_stats[region]['std'] for region in regions] + [missing])[codes]
+
+        global_percentile, region_percentile = _percentile_ranks(values, codes)
+
+        # First row per country, as analyzers read it with .iloc[0]
+        ids = self.df[self.id_col].to_numpy()
+        first = ~pd.Series(ids).duplicated().to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'rows': pd.Series(np.flatnonzero(first), index=ids[first]),
+                'regions': pd.Series(self.df[self.group_col].to_numpy()[first], index=ids[first]),
+                'value': values,
+                'global_percentile': global_percentile,
+                'region_percentile': region_percentile,
+                'global_zscore': (values - global_stats['mean'].to_numpy())
+                                 / global_stats['std'].to_numpy(),
+                'region_zscore': (values - region_mean) / region_std,
+                'global_stats': global_stats,
+                'region_stats': region_stats
+            }
+
+
+def _describe(frame: pd.DataFrame) -> pd.DataFrame:
+    """Distribution statistics of each column, indexed by column and columned by STATS"""
+    quantiles = frame.quantile([0.25, 0.5, 0.75]).T
+    return pd.DataFrame({
+        'count': frame.count(), 'mean': frame.mean(), 'std': frame.std(), 'min': frame.min(),
+        'q25': quantiles[0.25], 'median': quantiles[0.5], 'q75': quantiles[0.75],
+        'max': frame.max()
+    }, index=frame.columns, columns=STATS).astype(float)
+
+
+def _percentile_ranks(values: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Global and within-group percentile rank of every value, ignoring missing values.
+
+    Equal to stats.percentileofscore(population, value, kind='rank'), i.e.
+    (below + at_or_below + 1) * 50 / n. Each column is sorted once; a stable
+    sort of that order by group code gives the within-group order. Missing
+    values, and rows with a negative group code within groups, get NaN.
+    """
+    global_ranks = np.full(values.shape[::-1], np.nan)
+    group_ranks = np.full(values.shape[::-1], np.nan)
+    for j, column in enumerate(values.T):
+        present = np.flatnonzero(~np.isnan(column))
+        by_value = present[np.argsort(column[present])]
+        global_ranks[j, by_value] = _sorted_ranks(column[by_value])
+
+        by_value = by_value[codes[by_value] >= 0]
+        by_group = by_value[np.argsort(codes[by_value], kind='stable')]
+        group_ranks[j, by_group] = _sorted_ranks(column[by_group], codes[by_group])
+    return global_ranks.T, group_ranks.T
+
+
+def _sorted_ranks(sorted_values: np.ndarray, sorted_codes: Optional[np.ndarray] = None) -> np.ndarray:
+    """Percentile ranks of values sorted by group code, then value"""
+    n = len(sorted_values)
+    if n == 0:
+        return sorted_values
+
+    # Runs of equal codes (groups) and of equal values within them (ties)
+    new_group = np.zeros(n, dtype=bool)
+    new_group[0] = True
+    if sorted_codes is not None:
+        new_group[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    new_tie = new_group.copy()
+    new_tie[1:] |= sorted_values[1:] != sorted_values[:-1]
+    group_bounds, tie_bounds = np.append(np.flatnonzero(new_group), n), np.append(np.flatnonzero(new_tie), n)
+    group, tie = np.cumsum(new_group) - 1, np.cumsum(new_tie) - 1
+
+    start = group_bounds[group]
+    below = tie_bounds[tie] - start
+    at_or_below = tie_bounds[tie + 1] - start
+    size = group_bounds[group + 1] - start
+    return (below + at_or_below + 1) * (50.0 / size)
+
+
+def get_comparative_engine(df: pd.DataFrame) -> ComparativeEngine:
+    """Get the shared engine for a DataFrame so every analyzer reads the same tables"""
+    return shared_engine('comparative', df, ComparativeEngine)
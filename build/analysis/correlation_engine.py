@@ -0,0 +1,197 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+from utils.engines import shared_engine
+
+METHODS = ('pearson', 'spearman')
+NAN_POLICIES = ('pairwise', 'complete', 'zero', 'raise')
+
+class CorrelationEngine:
+    """Computes full correlation matrices between column blocks, optionally per group.
+
+    Every matrix is produced with a handful of matrix products over the whole
+    block rather than one scalar correlation per pair, and results are memoized
+    on (x columns, y columns, group, method, NaN policy).
+
+    NaN policies:
+        pairwise: each pair uses the rows where both columns are present (pandas .corr)
+        complete: rows with any missing value in either block are dropped
+        zero: missing values are treated as 0
+        raise: missing values raise a ValueError
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._cache: Dict[tuple, Dict] = {}
+
+    def correlate(self, x_cols: List[str], y_cols: List[str],
+                  group_by: Optional[str] = None, method: str = 'pearson',
+                  nan_policy: str = 'pairwise') -> Dict:
+        """Correlate every x column with every y column.
+
+        Returns {'r', 'p', 'n'} DataFrames indexed by x and columned by y, or a
+        dict of those keyed by group when group_by is given.
+        """
+        x_cols = self._available(x_cols)
+        y_cols = self._available(y_cols)
+        key = ('columns', tuple(x_cols), tuple(y_cols), group_by, method, nan_policy)
+        if key not in self._cache:
+            self._cache[key] = self._compute(
+                self.df[x_cols], self.df[y_cols], group_by, method, nan_policy
+            )
+        return self._cache[key]
+
+    def correlate_categories(self, category_col: str, y_cols: List[str],
+                             group_by: Optional[str] = None, method: str = 'pearson',
+                             nan_policy: str = 'pairwise') -> Dict:
+        """Correlate one-hot indicators of a categorical column with y columns"""
+        y_cols = self._available(y_cols)
+        key = ('categories', category_col, tuple(y_cols), group_by, method, nan_policy)
+        if key not in self._cache:
+            indicators = pd.get_dummies(self.df[category_col]).astype(float)
+            self._cache[key] = self._compute(
+                indicators, self.df[y_cols], group_by, method, nan_policy
+            )
+        return self._cache[key]
+
+    def clear(self) -> None:
+        """Drop memoized results, e.g. after the underlying data changes"""
+        self._cache.clear()
+
+    def _available(self, cols: List[str]) -> List[str]:
+        """Keep columns present in the data, dropping duplicates but keeping order"""
+        return [col for col in dict.fromkeys(cols) if col in self.df.columns]
+
+    def _compute(self, x: pd.DataFrame, y: pd.DataFrame, group_by: Optional[str],
+                 method: str, nan_policy: str) -> Dict:
+        if method not in METHODS:
+            raise ValueError(f"Unknown correlation method: {method}")
+        if nan_policy not in NAN_POLICIES:
+            raise ValueError(f"Unknown NaN policy: {nan_policy}")
+
+        if group_by is None:
+            return _correlation_block(x, y, method, nan_policy)
+
+        return {
+            group: _correlation_block(x.iloc[rows], y.iloc[rows], method, nan_policy)
+            for group, rows in self.df.groupby(group_by, sort=False).indices.items()
+        }
+
+
+def _correlation_block(x: pd.DataFrame, y: pd.DataFrame, method: str,
+                       nan_policy: str) -> Dict:
+    """Correlation, p-value and sample-size matrices for two column blocks"""
+    x_values = x.to_numpy(dtype=float)
+    y_values = y.to_numpy(dtype=float)
+
+    if nan_policy == 'raise' and (np.isnan(x_values).any() or np.isnan(y_values).any()):
+        raise ValueError("Missing values found in correlation input")
+    if nan_policy == 'zero':
+        x_values = np.nan_to_num(x_values, nan=0.0)
+        y_values = np.nan_to_num(y_values, nan=0.0)
+    elif nan_policy == 'complete':
+        complete = ~(np.isnan(x_values).any(axis=1) | np.isnan(y_values).any(axis=1))
+        x_values = x_values[complete]
+        y_values = y_values[complete]
+
+    if method == 'spearman':
+        r, n = _pairwise_pearson(_rank_columns(x_values), _rank_columns(y_values))
+        r = _rerank_partial_pairs(r, x_values, y_values)
+    else:
+        r, n = _pairwise_pearson(x_values, y_values)
+
+    # Two-sided t-test on r with n - 2 degrees of freedom (as in stats.pearsonr).
+    # scipy.stats is slow to import, so it is only loaded once a p-value is needed
+    from scipy import stats
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dof = n - 2
+        t = r * np.sqrt(dof / np.clip(1 - r ** 2, 0, None))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p = np.where(dof > 0, p, np.nan)
+    p = np.where(np.isnan(r), np.nan, p)
+
+    return {
+        'r': pd.DataFrame(r, index=x.columns, columns=y.columns),
+        'p': pd.DataFrame(p, index=x.columns, columns=y.columns),
+        'n': pd.DataFrame(n.astype(int), index=x.columns, columns=y.columns)
+    }
+
+
+def _pairwise_pearson(x: np.ndarray, y: np.ndarray):
+    """Pearson r over pairwise-complete rows using masked matrix products.
+
+    Inputs are (rows, columns), or (batch, rows, columns) to correlate many
+    resamples at once; a batch of 1 broadcasts against the other block.
+    """
+    x_mask = ~np.isnan(x)
+    y_mask = ~np.isnan(y)
+
+    # Center on column means first to keep the moment sums well conditioned
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = np.where(x_mask, x - np.where(x_mask, x, 0.0).sum(axis=-2, keepdims=True)
+                     / x_mask.sum(axis=-2, keepdims=True), 0.0)
+        y = np.where(y_mask, y - np.where(y_mask, y, 0.0).sum(axis=-2, keepdims=True)
+                     / y_mask.sum(axis=-2, keepdims=True), 0.0)
+    x_mask = x_mask.astype(float)
+    y_mask = y_mask.astype(float)
+    x_t = np.swapaxes(x, -1, -2)
+    x_mask_t = np.swapaxes(x_mask, -1, -2)
+
+    n = x_mask_t @ y_mask
+    sum_x = x_t @ y_mask
+    sum_y = x_mask_t @ y
+    sum_xx = np.swapaxes(x ** 2, -1, -2) @ y_mask
+    sum_yy = x_mask_t @ (y ** 2)
+    sum_xy = x_t @ y
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x ** 2 / n
+        var_y = sum_yy - sum_y ** 2 / n
+        r = cov / np.sqrt(var_x * var_y)
+
+    r = np.where((n >= 2) & (var_x > 0) & (var_y > 0), r, np.nan)
+    return np.clip(r, -1.0, 1.0), n
+
+
+def _rerank_partial_pairs(r: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Recompute Spearman r for pairs whose complete rows differ from either column's.
+
+    Ranking each column over all its present rows only matches ranking within
+    a pair's complete rows (as pandas does) when the other column drops no
+    further rows, so those pairs, usually few, are re-ranked one by one.
+    """
+    x_missing = np.isnan(x)
+    y_missing = np.isnan(y)
+    partial = ((x_missing.T.astype(float) @ ~y_missing)
+               + ((~x_missing).T.astype(float) @ y_missing)) > 0
+    if not partial.any():
+        return r
+
+    r = r.copy()
+    for i, j in zip(*np.nonzero(partial)):
+        rows = ~(x_missing[:, i] | y_missing[:, j])
+        pair_r, _ = _pairwise_pearson(_rank_columns(x[rows, i:i + 1]),
+                                      _rank_columns(y[rows, j:j + 1]))
+        r[i, j] = pair_r[0, 0]
+    return r
+
+
+def _rank_columns(values: np.ndarray) -> np.ndarray:
+    """Average ranks per column, leaving missing values missing"""
+    return pd.DataFrame(values).rank(method='average').to_numpy(dtype=float)
+
+
+def nested_dict(matrix: pd.DataFrame, transpose: bool = False) -> Dict:
+    """Format a correlation matrix as {row: {column: float}}"""
+    if transpose:
+        matrix = matrix.T
+    return {
+        str(row): {str(col): float(value) for col, value in values.items()}
+        for row, values in matrix.iterrows()
+    }
+
+
+def get_correlation_engine(df: pd.DataFrame) -> CorrelationEngine:
+    """Get the shared engine for a DataFrame so analyzers reuse each other's matrices"""
+    return shared_engine('correlation', df, CorrelationEngine)
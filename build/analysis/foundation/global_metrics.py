@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
 from typing import Dict, List
+from analysis.comparative_engine import get_comparative_engine
+from analysis.correlation_engine import get_correlation_engine, nested_dict
 
 class GlobalMetricsAnalyzer:
     def __init__(self, df: pd.DataFrame):
@@ -14,6 +15,8 @@ class GlobalMetricsAnalyzer:
         self.wellbeing_metrics = [
             'Life Ladder', 'Average MHQ Score'
         ] + [col for col in df.columns if 'Average' in col and 'Score' in col]
+        self.correlations = get_correlation_engine(df)
+        self.comparative = get_comparative_engine(df)
 
     def get_regional_summary(self) -> Dict:
         """Compute regional summaries for key metrics"""
@@ -54,39 +57,23 @@ class GlobalMetricsAnalyzer:
     def analyze_singapore_position(self) -> Dict:
         """Analyze Singapore's position relative to global distributions"""
         try:
-            singapore = self.df[self.df['Country'] == 'Singapore']
-            if len(singapore) == 0:
+            if 'Singapore' not in self.comparative:
                 return {'error': 'No data available for Singapore'}
 
-            music_position = {}
-            for feature in self.music_features:
-                if feature in singapore.columns:
-                    music_position[str(feature)] = {
-                        'value': float(singapore[feature].iloc[0]),
-                        'global_mean': float(self.df[feature].mean()),
-                        'global_std': float(self.df[feature].std()),
-                        'percentile': float(stats.percentileofscore(
-                            self.df[feature].dropna(), 
-                            singapore[feature].iloc[0]
-                        ))
-                    }
-
-            wellbeing_position = {}
-            for metric in self.wellbeing_metrics:
-                if metric in singapore.columns:
-                    wellbeing_position[str(metric)] = {
-                        'value': float(singapore[metric].iloc[0]),
-                        'global_mean': float(self.df[metric].mean()),
-                        'global_std': float(self.df[metric].std()),
-                        'percentile': float(stats.percentileofscore(
-                            self.df[metric].dropna(), 
-                            singapore[metric].iloc[0]
-                        ))
+            def position(cols: List[str]) -> Dict:
+                return {
+                    str(col): {
+                        'value': float(row['value']),
+                        'global_mean': float(row['global_mean']),
+                        'global_std': float(row['global_std']),
+                        'percentile': float(row['global_percentile'])
                     }
+                    for col, row in self.comparative.position('Singapore', cols).iterrows()
+                }
 
             return {
-                'music_features': music_position,
-                'wellbeing': wellbeing_position
+                'music_features': position(self.music_features),
+                'wellbeing': position(self.wellbeing_metrics)
             }
         except Exception as e:
             return {'error': str(e)}
@@ -94,20 +81,8 @@ class GlobalMetricsAnalyzer:
     def get_correlation_matrix(self) -> Dict:
         """Compute correlation matrix between music features and wellbeing metrics"""
         try:
-            # Get available features and metrics
-            available_features = [f for f in self.music_features if f in self.df.columns]
-            available_metrics = [m for m in self.wellbeing_metrics if m in self.df.columns]
-            
-            # Calculate correlations
-            correlations = {}
-            for feature in available_features:
-                correlations[str(feature)] = {}
-                for metric in available_metrics:
-                    correlations[str(feature)][str(metric)] = float(
-                        self.df[feature].corr(self.df[metric])
-                    )
-            
-            return correlations
+            result = self.correlations.correlate(self.music_features, self.wellbeing_metrics)
+            return nested_dict(result['r'])
         except Exception as e:
             return {'error': str(e)}
 
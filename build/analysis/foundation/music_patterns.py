@@ -1,8 +1,9 @@
 import pandas as pd
-import numpy as np
 from scipy import stats
 from typing import Dict, List
 
+from analysis.similarity_index import get_similarity_index
+
 class MusicPatternAnalyzer:
     def __init__(self, df: pd.DataFrame):
         self.df = df
@@ -87,22 +88,7 @@ class MusicPatternAnalyzer:
 
         return profile
     
-    def find_similar_countries(self, metric='euclidean', n_neighbors=5):
+    def find_similar_countries(self, metric='euclidean', n_neighbors=5, country='Singapore'):
         """Find countries with similar music profiles"""
-        features_normalized = (self.df[self.music_features] - self.df[self.music_features].mean()) / \
-                            self.df[self.music_features].std()
-        
-        singapore_idx = self.df[self.df['Country'] == 'Singapore'].index[0]
-        singapore_profile = features_normalized.loc[singapore_idx]
-        
-        distances = {}
-        for idx, row in features_normalized.iterrows():
-            if idx != singapore_idx:
-                if metric == 'euclidean':
-                    dist = np.sqrt(((row - singapore_profile) ** 2).sum())
-                elif metric == 'cosine':
-                    dist = 1 - np.dot(row, singapore_profile) / \
-                          (np.linalg.norm(row) * np.linalg.norm(singapore_profile))
-                distances[self.df.loc[idx, 'Country']] = dist
-        
-        return dict(sorted(distances.items(), key=lambda x: x[1])[:n_neighbors]) 
\ No newline at end of file
+        index = get_similarity_index(self.df, 'music', metric)
+        return index.kneighbors([country], n_neighbors)[country]
@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
 from typing import Dict, List
+from analysis.comparative_engine import get_comparative_engine
+from analysis.correlation_engine import get_correlation_engine
 
 class WellbeingAnalyzer:
     def __init__(self, df: pd.DataFrame):
@@ -19,6 +20,8 @@ class WellbeingAnalyzer:
             '% Distressed', '% Struggling', '% Enduring',
             '% Managing', '% Succeeding', '% Thriving'
         ]
+        self.correlations = get_correlation_engine(df)
+        self.comparative = get_comparative_engine(df)
 
     def get_mhq_profile(self) -> Dict:
         """Get MHQ profile with proper formatting"""
@@ -67,28 +70,20 @@ class WellbeingAnalyzer:
 
     def analyze_singapore_wellbeing(self) -> Dict:
         """Analyze Singapore's wellbeing metrics"""
-        singapore = self.df[self.df['Country'] == 'Singapore']
-        if len(singapore) == 0:
+        if 'Singapore' not in self.comparative:
             return {
                 'error': 'No data available for Singapore'
             }
 
-        asia = self.df[self.df['region'] == 'Asia']
-        
-        mhq_analysis = {}
-        for dim in self.mhq_dimensions:
-            if dim in singapore.columns:
-                mhq_analysis[str(dim)] = {
-                    'value': float(singapore[dim].iloc[0]),
-                    'global_percentile': float(stats.percentileofscore(
-                        self.df[dim].dropna(), 
-                        singapore[dim].iloc[0]
-                    )),
-                    'asia_percentile': float(stats.percentileofscore(
-                        asia[dim].dropna(), 
-                        singapore[dim].iloc[0]
-                    ))
-                }
+        position = self.comparative.position('Singapore', self.mhq_dimensions)
+        mhq_analysis = {
+            str(dim): {
+                'value': float(row['value']),
+                'global_percentile': float(row['global_percentile']),
+                'asia_percentile': float(row['region_percentile'])
+            }
+            for dim, row in position.iterrows()
+        }
 
         return {
             'mhq_dimensions': mhq_analysis
@@ -96,11 +91,10 @@ class WellbeingAnalyzer:
 
     def find_wellbeing_correlations(self) -> Dict:
         """Calculate correlations between wellbeing metrics"""
-        # Get available dimensions
-        available_dims = [dim for dim in self.mhq_dimensions if dim in self.df.columns]
-        
         # Calculate correlation matrix
-        correlation_matrix = self.df[available_dims].corr().round(3)
+        correlation_matrix = self.correlations.correlate(
+            self.mhq_dimensions, self.mhq_dimensions
+        )['r'].round(3)
         
         # Convert to nested dictionary with proper formatting
         formatted_correlations = {
@@ -0,0 +1,197 @@
+import functools
+import hashlib
+import importlib
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, Optional
+
+from analysis.comparative_engine import COLUMN_GROUPS
+from analysis.registry import ANALYZERS
+from utils.atomic import write_pickle
+
+DEFAULT_CACHE_DIR = 'data/pipeline_cache'
+EXECUTORS = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+class Node:
+    """One pipeline step, computed from its input columns and upstream results.
+
+    func is called as func(frame, upstream) where frame holds only the node's
+    columns (in the data's column order) and upstream maps each upstream node
+    name to its result. With a process pool func must be picklable.
+    """
+
+    def __init__(self, name: str, func: Callable, columns: Iterable[str] = (),
+                 upstream: Iterable[str] = (), stage: Optional[str] = None, version: int = 1):
+        self.name = name
+        self.func = func
+        self.columns = resolve_columns(columns)
+        self.upstream = list(upstream)
+        self.stage = stage
+        self.version = version
+
+
+class Pipeline:
+    """Runs a DAG of nodes concurrently and recomputes only what changed.
+
+    Each result is memoized under a key hashing the node's input columns and
+    its upstream nodes' keys, so after a data change only nodes reading a
+    changed column, and the nodes downstream of them, run again. Nodes whose
+    upstream results are ready run concurrently in a thread or process pool.
+    Results reporting an 'error' are never memoized.
+    """
+
+    def __init__(self, nodes: Iterable[Node] = (), workers: Optional[int] = None,
+                 executor: str = 'thread', cache_dir: Optional[str] = None):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        self.nodes: Dict[str, Node] = {}
+        self.workers = workers or os.cpu_count()
+        self.executor = executor
+        self.cache_dir = cache_dir
+        # Per node of the last run: {'seconds': measured runtime, 'cached': bool}
+        self.timings: Dict[str, Dict] = {}
+        self._memo: Dict[str, object] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: Node) -> None:
+        """Add a node; its upstream nodes must already be added, which keeps the graph acyclic"""
+        if node.name in self.nodes:
+            raise ValueError(f"Duplicate node: {node.name}")
+        missing = [name for name in node.upstream if name not in self.nodes]
+        if missing:
+            raise ValueError(f"Unknown upstream node(s) of {node.name}: {missing}")
+        self.nodes[node.name] = node
+
+    def edges(self) -> List[tuple]:
+        """(upstream, downstream) pairs in insertion order"""
+        return [(upstream, node.name) for node in self.nodes.values() for upstream in node.upstream]
+
+    def run(self, df: pd.DataFrame, targets: Optional[List[str]] = None) -> Dict[str, object]:
+        """Results of the target nodes (default all) and everything upstream of them"""
+        names = self._with_upstream(targets or list(self.nodes))
+        keys = self._keys(df, names)
+
+        results, self.timings = {}, {}
+        for name in names:
+            hit, result = self._recall(keys[name])
+            if hit:
+                results[name] = result
+                self.timings[name] = {'seconds': 0.0, 'cached': True}
+
+        waiting = [name for name in names if name not in results]
+        with EXECUTORS[self.executor](max_workers=self.workers) as pool:
+            running = {}
+            while waiting or running:
+                for name in [name for name in waiting
+                             if all(up in results for up in self.nodes[name].upstream)]:
+                    node = self.nodes[name]
+                    frame = df[[col for col in df.columns if col in node.columns]]
+                    upstream = {up: results[up] for up in node.upstream}
+                    running[pool.submit(_timed, node.func, frame, upstream)] = name
+                    waiting.remove(name)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name], seconds = future.result()
+                    self.timings[name] = {'seconds': seconds, 'cached': False}
+                    self._remember(keys[name], results[name])
+        return results
+
+    def clear(self) -> None:
+        """Drop memoized results (persisted results are kept)"""
+        self._memo.clear()
+
+    def _with_upstream(self, targets: List[str]) -> List[str]:
+        """Targets and their ancestors, in insertion (topological) order"""
+        unknown = [name for name in targets if name not in self.nodes]
+        if unknown:
+            raise KeyError(f"Unknown node(s): {unknown}")
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.nodes[name].upstream)
+        return [name for name in self.nodes if name in needed]
+
+    def _keys(self, df: pd.DataFrame, names: List[str]) -> Dict[str, str]:
+        """Memo key per node from its column hashes and its upstream nodes' keys"""
+        columns = {col for name in names for col in self.nodes[name].columns if col in df.columns}
+        column_hashes = {
+            col: hashlib.sha1(pd.util.hash_pandas_object(df[col], index=True).values.tobytes())
+                        .hexdigest()
+            for col in columns
+        }
+
+        keys = {}
+        for name in names:
+            node = self.nodes[name]
+            keys[name] = hashlib.sha1(repr((
+                node.name, node.version,
+                [(col, column_hashes.get(col)) for col in node.columns],
+                [keys[up] for up in node.upstream]
+            )).encode()).hexdigest()
+        return keys
+
+    def _recall(self, key: str) -> tuple:
+        if key in self._memo:
+            return True, self._memo[key]
+        path = self._cache_path(key)
+        if path and os.path.exists(path):
+            self._memo[key] = pd.read_pickle(path)
+            return True, self._memo[key]
+        return False, None
+
+    def _remember(self, key: str, result) -> None:
+        if isinstance(result, dict) and 'error' in result:
+            return
+        self._memo[key] = result
+        path = self._cache_path(key)
+        if path:
+            write_pickle(path, result)
+
+    def _cache_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f'{key}.pkl') if self.cache_dir else None
+
+
+def resolve_columns(names: Iterable[str]) -> List[str]:
+    """Expand column group names to their columns, keeping order and dropping duplicates"""
+    return list(dict.fromkeys(
+        col for name in names for col in COLUMN_GROUPS.get(name, [name])
+    ))
+
+
+def analyzer_pipeline(names: Optional[List[str]] = None, **options) -> Pipeline:
+    """Pipeline with one node per cached method of the registered analyzers.
+
+    Nodes are named <analyzer>.<method>, staged by their analysis subpackage
+    (foundation, relationships, regional, singapore_focus) and versioned with
+    their analyzer. Further options are passed to Pipeline.
+    """
+    pipeline = Pipeline(**options)
+    for name in names or ANALYZERS:
+        spec = ANALYZERS[name]
+        for method in spec['methods']:
+            pipeline.add(Node(
+                f'{name}.{method}', functools.partial(_run_analyzer, name, method),
+                columns=spec['inputs'][method], stage=spec['class'].split('.')[1],
+                version=spec['version']
+            ))
+    return pipeline
+
+
+def _run_analyzer(name: str, method: str, frame: pd.DataFrame, upstream: Dict) -> object:
+    module_name, class_name = ANALYZERS[name]['class'].rsplit('.', 1)
+    analyzer_class = getattr(importlib.import_module(module_name), class_name)
+    return getattr(analyzer_class(frame), method)()
+
+
+def _timed(func: Callable, frame: pd.DataFrame, upstream: Dict) -> tuple:
+    """Run a node and measure its runtime where it runs (thread or worker process)"""
+    started = time.perf_counter()
+    result = func(frame, upstream)
+    return result, time.perf_counter() - started
@@ -2,6 +2,8 @@ from typing import Dict, List
 import pandas as pd
 import numpy as np
 from scipy import stats
+from analysis.correlation_engine import get_correlation_engine, nested_dict
+from analysis.resampling import get_resampling_engine
 
 class CrossRegionalAnalyzer:
     def __init__(self, df: pd.DataFrame):
@@ -14,6 +16,8 @@ class CrossRegionalAnalyzer:
                                  if 'Average' in col or '%' in col]
         self.happiness_metrics = ['Life Ladder', 'Social support', 
                                 'Positive affect', 'Negative affect']
+        self.correlations = get_correlation_engine(df)
+        self.resampling = get_resampling_engine(df)
 
     def analyze_cross_regional_patterns(self) -> Dict:
         """Analyze patterns across different regions"""
@@ -32,6 +36,11 @@ class CrossRegionalAnalyzer:
             'significant_differences': {}
         }
         
+        # Bootstrap intervals and permutation p-values for every feature's F
+        anova = self.resampling.anova(
+            [feature for feature in self.music_features if feature in self.df.columns], 'region'
+        )
+
         # Analyze each music feature across regions
         for feature in self.music_features:
             if feature in self.df.columns:
@@ -49,7 +58,10 @@ class CrossRegionalAnalyzer:
                 f_stat, p_val = stats.f_oneway(*groups)
                 music_diff['significant_differences'][str(feature)] = {
                     'f_statistic': float(f_stat),
-                    'p_value': float(p_val)
+                    'p_value': float(p_val),
+                    'ci_low': float(anova.at[feature, 'ci_low']),
+                    'ci_high': float(anova.at[feature, 'ci_high']),
+                    'p_perm': float(anova.at[feature, 'p_perm'])
                 }
         
         # Genre distribution by region
@@ -94,18 +106,15 @@ class CrossRegionalAnalyzer:
             'regional_patterns': {}
         }
         
+        regional_results = self.correlations.correlate(
+            self.music_features, self.wellbeing_metrics, group_by='region'
+        )
+        region_sizes = self.df['region'].value_counts()
         for region in self.regions:
-            region_data = self.df[self.df['region'] == region]
-            if len(region_data) >= 5:  # Minimum samples for correlation
-                correlations['regional_patterns'][str(region)] = {
-                    str(feature): {
-                        str(metric): float(region_data[feature].corr(region_data[metric]))
-                        for metric in self.wellbeing_metrics
-                        if metric in region_data.columns
-                    }
-                    for feature in self.music_features
-                    if feature in region_data.columns
-                }
+            if region_sizes[region] >= 5:  # Minimum samples for correlation
+                correlations['regional_patterns'][str(region)] = nested_dict(
+                    regional_results[region]['r']
+                )
         
         return correlations
 
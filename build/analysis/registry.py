@@ -0,0 +1,224 @@
+import argparse
+import importlib
+import json
+import os
+import threading
+import pandas as pd
+from typing import Dict, List, Optional
+from utils.atomic import write_json
+
+DEFAULT_CACHE_DIR = 'data/analyzer_cache'
+
+# Analyzer classes by name, with the parameterless methods whose results are
+# cached and served. Bump an analyzer's version whenever its output changes
+# so results persisted for the old version are ignored. Each method lists the
+# columns it reads, as column groups (see comparative_engine.COLUMN_GROUPS)
+# or column names, so the pipeline only reruns it when one of them changes.
+ANALYZERS = {
+    'music_patterns': {
+        'class': 'analysis.foundation.music_patterns.MusicPatternAnalyzer',
+        'version': 1,
+        'methods': ['get_feature_distributions', 'analyze_regional_preferences',
+                    'get_singapore_profile', 'find_similar_countries'],
+        'inputs': {
+            'get_feature_distributions': ['music'],
+            'analyze_regional_preferences': ['region', 'music', 'track_genre'],
+            'get_singapore_profile': ['Country', 'music', 'track_genre'],
+            'find_similar_countries': ['Country', 'music']
+        }
+    },
+    'wellbeing': {
+        'class': 'analysis.foundation.wellbeing_landscape.WellbeingAnalyzer',
+        'version': 1,
+        'methods': ['get_mhq_profile', 'analyze_singapore_wellbeing',
+                    'find_wellbeing_correlations'],
+        'inputs': {
+            'get_mhq_profile': ['region', 'mhq_scores', 'wellbeing_categories'],
+            'analyze_singapore_wellbeing': ['Country', 'region', 'mhq_scores'],
+            'find_wellbeing_correlations': ['mhq_scores']
+        }
+    },
+    'global_metrics': {
+        'class': 'analysis.foundation.global_metrics.GlobalMetricsAnalyzer',
+        'version': 1,
+        'methods': ['get_regional_summary', 'analyze_singapore_position',
+                    'get_correlation_matrix', 'analyze_genre_impact'],
+        'inputs': {
+            'get_regional_summary': ['region', 'music', 'Life Ladder', 'mhq_scores'],
+            'analyze_singapore_position': ['Country', 'region', 'music', 'Life Ladder',
+                                           'mhq_scores'],
+            'get_correlation_matrix': ['music', 'Life Ladder', 'mhq_scores'],
+            'analyze_genre_impact': ['track_genre', 'Life Ladder', 'mhq_scores']
+        }
+    },
+    'music_happiness': {
+        'class': 'analysis.relationships.music_happiness.MusicHappinessAnalyzer',
+        'version': 1,
+        'methods': ['analyze_global_correlations', 'analyze_regional_patterns'],
+        'inputs': {
+            'analyze_global_correlations': ['music', 'happiness', 'cultural'],
+            'analyze_regional_patterns': ['region', 'music', 'happiness', 'cultural']
+        }
+    },
+    'music_mhq': {
+        'class': 'analysis.relationships.music_mhq.MusicMHQAnalyzer',
+        'version': 1,
+        'methods': ['analyze_global_correlations', 'analyze_regional_variations',
+                    'analyze_singapore_specific'],
+        'inputs': {
+            'analyze_global_correlations': ['music', 'mhq_scores', 'wellbeing_categories'],
+            'analyze_regional_variations': ['region', 'music', 'mhq_scores',
+                                            'wellbeing_categories'],
+            'analyze_singapore_specific': ['Country', 'region', 'music', 'mhq_scores',
+                                           'wellbeing_categories']
+        }
+    },
+    'asia': {
+        'class': 'analysis.regional.asia_analysis.AsiaAnalyzer',
+        'version': 1,
+        'methods': ['analyze_asian_patterns'],
+        'inputs': {
+            'analyze_asian_patterns': ['Country', 'region', 'track_genre', 'music',
+                                       'mhq_scores', 'happiness', 'cultural', 'age',
+                                       'education']
+        }
+    },
+    'cross_regional': {
+        'class': 'analysis.regional.cross_regional.CrossRegionalAnalyzer',
+        'version': 1,
+        'methods': ['analyze_cross_regional_patterns'],
+        'inputs': {
+            'analyze_cross_regional_patterns': ['region', 'track_genre', 'music',
+                                                'mhq_scores', 'wellbeing_categories',
+                                                'happiness', 'cultural']
+        }
+    },
+    'recommendations': {
+        'class': 'analysis.singapore_focus.recommendations.RecommendationEngine',
+        'version': 1,
+        'methods': ['generate_recommendations'],
+        'inputs': {
+            'generate_recommendations': ['Country', 'region', 'track_genre', 'music',
+                                         'mhq_scores', 'age', 'education']
+        }
+    },
+    'singapore_comparative': {
+        'class': 'analysis.singapore_focus.comparative.SingaporeComparative',
+        'version': 2,
+        'methods': ['analyze_demographic_position', 'analyze_wellbeing_position',
+                    'analyze_music_characteristics'],
+        'inputs': {
+            'analyze_demographic_position': ['Country', 'region', 'age', 'employment',
+                                             'education'],
+            'analyze_wellbeing_position': ['Country', 'region', 'wellbeing_categories',
+                                           'mhq_scores'],
+            'analyze_music_characteristics': ['Country', 'region', 'track_genre', 'music',
+                                              'Average MHQ Score']
+        }
+    },
+    'cultural_context': {
+        'class': 'analysis.singapore_focus.cultural_context.CulturalContextAnalyzer',
+        'version': 1,
+        'methods': ['analyze_cultural_influences'],
+        'inputs': {
+            'analyze_cultural_influences': ['Country', 'region', 'track_genre', 'music',
+                                            'cultural', 'wellbeing_categories',
+                                            'Average MHQ Score']
+        }
+    }
+}
+
+class AnalyzerRegistry:
+    """Constructs analyzers on first use and caches their results on disk.
+
+    Analyzer modules (and the scipy/plotly imports they pull in) are only
+    imported when an analyzer is first needed. Results are persisted under
+    the dataset version and the analyzer's version, so a fresh process serves
+    them from disk without importing or constructing the analyzer at all.
+    """
+
+    def __init__(self, df: pd.DataFrame, data_version: str,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.df = df
+        self.data_version = data_version
+        self.cache_dir = cache_dir
+        self._analyzers: Dict[str, object] = {}
+        self._results: Dict[tuple, Dict] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str):
+        """Get an analyzer by name, importing and constructing it on first use"""
+        with self._lock:
+            if name not in self._analyzers:
+                module_name, class_name = ANALYZERS[name]['class'].rsplit('.', 1)
+                analyzer_class = getattr(importlib.import_module(module_name), class_name)
+                self._analyzers[name] = analyzer_class(self.df)
+            return self._analyzers[name]
+
+    def result(self, name: str, method: str) -> Dict:
+        """Get a cached analyzer result, computing and persisting it on a miss.
+
+        Results reporting an 'error' are returned but never persisted.
+        """
+        if method not in ANALYZERS[name]['methods']:
+            raise KeyError(f"{method} is not a cached method of {name}")
+
+        key = (name, method)
+        if key in self._results:
+            return self._results[key]
+
+        path = self.cache_path(name, method)
+        if path and os.path.exists(path):
+            with open(path) as f:
+                result = json.load(f)
+        else:
+            result = getattr(self.get(name), method)()
+            if isinstance(result, dict) and 'error' in result:
+                return result
+            if path:
+                write_json(path, result)
+        self._results[key] = result
+        return result
+
+    def clear(self) -> None:
+        """Drop memoized results (persisted results are kept)"""
+        self._results.clear()
+
+    def cache_path(self, name: str, method: str) -> Optional[str]:
+        """File a result is persisted to for this dataset and analyzer version"""
+        if not self.cache_dir:
+            return None
+        version = ANALYZERS[name]['version']
+        return os.path.join(
+            self.cache_dir, self.data_version[:16], f'{name}.v{version}.{method}.json'
+        )
+
+    def warm(self, names: Optional[List[str]] = None) -> int:
+        """Compute and persist every cached result; returns how many are available"""
+        count = 0
+        for name in names or ANALYZERS:
+            for method in ANALYZERS[name]['methods']:
+                result = self.result(name, method)
+                count += not (isinstance(result, dict) and 'error' in result)
+        return count
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from utils.data_loader import DEFAULT_DATA_PATH, load_data
+    from utils.snapshot import DataSnapshot
+
+    parser = argparse.ArgumentParser(
+        description='Precompute analyzer results so fresh workers serve them from disk'
+    )
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--analyzers', nargs='+', choices=sorted(ANALYZERS))
+    options = parser.parse_args(args)
+
+    df = load_data(options.data)
+    registry = AnalyzerRegistry(df, DataSnapshot(df).version)
+    count = registry.warm(options.analyzers)
+    print(f"Cached {count} analyzer results in {registry.cache_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from scipy import stats
 from typing import Dict, List, Tuple
+from analysis.correlation_engine import get_correlation_engine, nested_dict
 
 class MusicHappinessAnalyzer:
     def __init__(self, df):
@@ -16,41 +17,30 @@ class MusicHappinessAnalyzer:
             'Freedom to make life choices', 'Generosity', 'Positive affect',
             'Negative affect'
         ]
+        self.correlations = get_correlation_engine(df)
 
     def analyze_global_correlations(self) -> Dict:
         """Analyze global correlations between music features and happiness metrics"""
-        correlations = {}
-        for metric in self.happiness_metrics:
-            if metric in self.df.columns:
-                correlations[str(metric)] = {
-                    str(feature): float(self.df[feature].corr(self.df[metric]))
-                    for feature in self.music_features
-                    if feature in self.df.columns
-                }
-        return correlations
+        result = self.correlations.correlate(self.music_features, self.happiness_metrics)
+        return self._get_correlations(result)
 
     def analyze_regional_patterns(self) -> Dict:
         """Analyze regional patterns in music-happiness relationships"""
+        regional_correlations = self.correlations.correlate(
+            self.music_features, self.happiness_metrics, group_by='region'
+        )
         regional_patterns = {}
-        for region in self.df['region'].unique():
+        for region, result in regional_correlations.items():
             region_data = self.df[self.df['region'] == region]
             regional_patterns[str(region)] = {
-                'correlations': self._get_correlations(region_data),
+                'correlations': self._get_correlations(result),
                 'happiness_profile': self._get_happiness_profile(region_data)
             }
         return regional_patterns
 
-    def _get_correlations(self, data: pd.DataFrame) -> Dict:
-        """Calculate correlations for a specific dataset"""
-        correlations = {}
-        for metric in self.happiness_metrics:
-            if metric in data.columns:
-                correlations[str(metric)] = {
-                    str(feature): float(data[feature].corr(data[metric]))
-                    for feature in self.music_features
-                    if feature in data.columns
-                }
-        return correlations
+    def _get_correlations(self, result: Dict) -> Dict:
+        """Format a correlation result as {metric: {feature: r}}"""
+        return nested_dict(result['r'], transpose=True)
 
     def _get_happiness_profile(self, data: pd.DataFrame) -> Dict:
         """Get happiness profile for a specific dataset"""
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from scipy import stats
 from typing import Dict, List, Tuple
+from analysis.correlation_engine import CorrelationEngine, get_correlation_engine, nested_dict
 
 class MusicMHQAnalyzer:
     def __init__(self, df):
@@ -24,6 +25,7 @@ class MusicMHQAnalyzer:
             '% Distressed', '% Struggling', '% Enduring',
             '% Managing', '% Succeeding', '% Thriving'
         ]
+        self.correlations = get_correlation_engine(df)
 
     def analyze_global_correlations(self) -> Dict:
         """Analyze global correlations between music features and MHQ metrics"""
@@ -35,27 +37,13 @@ class MusicMHQAnalyzer:
 
     def _analyze_dimension_correlations(self) -> Dict:
         """Analyze correlations with MHQ dimensions"""
-        correlations = {}
-        for dimension in self.mhq_dimensions:
-            if dimension in self.df.columns:
-                correlations[str(dimension)] = {
-                    str(feature): float(self.df[feature].corr(self.df[dimension]))
-                    for feature in self.music_features
-                    if feature in self.df.columns
-                }
-        return correlations
+        result = self.correlations.correlate(self.music_features, self.mhq_dimensions)
+        return nested_dict(result['r'], transpose=True)
 
     def _analyze_category_correlations(self) -> Dict:
         """Analyze correlations with MHQ categories"""
-        correlations = {}
-        for category in self.mhq_categories:
-            if category in self.df.columns:
-                correlations[str(category)] = {
-                    str(feature): float(self.df[feature].corr(self.df[category]))
-                    for feature in self.music_features
-                    if feature in self.df.columns
-                }
-        return correlations
+        result = self.correlations.correlate(self.music_features, self.mhq_categories)
+        return nested_dict(result['r'], transpose=True)
 
     def _identify_key_patterns(self) -> Dict:
         """Identify strongest music-MHQ relationships"""
@@ -66,14 +54,9 @@ class MusicMHQAnalyzer:
         }
         
         # Analyze each music feature's relationship with MHQ dimensions
-        for feature in self.music_features:
-            if feature in self.df.columns:
-                dimension_correlations = {
-                    str(dim): float(self.df[feature].corr(self.df[dim]))
-                    for dim in self.mhq_dimensions
-                    if dim in self.df.columns
-                }
-                
+        result = self.correlations.correlate(self.music_features, self.mhq_dimensions)
+        for feature, dimension_correlations in nested_dict(result['r']).items():
+            if dimension_correlations:
                 # Find strongest correlation
                 strongest_dim = max(dimension_correlations.items(), key=lambda x: abs(x[1]))
                 
@@ -92,26 +75,21 @@ class MusicMHQAnalyzer:
 
     def analyze_regional_variations(self) -> Dict:
         """Analyze regional variations in music-MHQ relationships"""
+        regional_correlations = self.correlations.correlate(
+            self.music_features, self.mhq_dimensions, group_by='region'
+        )
         variations = {}
-        for region in self.df['region'].unique():
+        for region, result in regional_correlations.items():
             region_data = self.df[self.df['region'] == region]
             variations[str(region)] = {
-                'dimension_correlations': self._get_region_correlations(region_data),
+                'dimension_correlations': self._get_region_correlations(result),
                 'mhq_profile': self._get_region_mhq_profile(region_data)
             }
         return variations
 
-    def _get_region_correlations(self, data: pd.DataFrame) -> Dict:
-        """Calculate correlations for a specific region"""
-        correlations = {}
-        for dimension in self.mhq_dimensions:
-            if dimension in data.columns:
-                correlations[str(dimension)] = {
-                    str(feature): float(data[feature].corr(data[dimension]))
-                    for feature in self.music_features
-                    if feature in data.columns
-                }
-        return correlations
+    def _get_region_correlations(self, result: Dict) -> Dict:
+        """Format a group's correlation result as {dimension: {feature: r}}"""
+        return nested_dict(result['r'], transpose=True)
 
     def _get_region_mhq_profile(self, data: pd.DataFrame) -> Dict:
         """Get MHQ profile for a specific region"""
@@ -163,7 +141,9 @@ class MusicMHQAnalyzer:
                     if cat in singapore.columns
                 }
             },
-            'music_correlations': self._get_region_correlations(singapore),
+            'music_correlations': self._get_region_correlations(
+                CorrelationEngine(singapore).correlate(self.music_features, self.mhq_dimensions)
+            ),
             'regional_context': {
                 'dimension_percentiles': {
                     str(dim): float(stats.percentileofscore(
@@ -0,0 +1,292 @@
+import argparse
+import hashlib
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from analysis.correlation_engine import _pairwise_pearson
+from utils.atomic import write_pickle
+from utils.engines import shared_engine
+
+DEFAULT_RESAMPLES = 10_000
+BATCH_SIZE = 1000
+# Upper bound on resampled rows per batch, so memory stays flat on large datasets
+MAX_BATCH_ROWS = 1_000_000
+DEFAULT_CACHE_DIR = 'data/resampling_cache'
+
+class ResamplingEngine:
+    """Bootstrap confidence intervals and permutation p-values for reported statistics.
+
+    Resamples are drawn as (batch, rows) index matrices and each batch is
+    evaluated with a few array operations. Every batch gets its own child of
+    one SeedSequence, so results are identical whether batches run serially
+    or are sharded across a process pool. Results are memoized and, when
+    cache_dir is set, persisted under a hash of the input data and settings.
+    """
+
+    def __init__(self, df: pd.DataFrame, n_resamples: int = DEFAULT_RESAMPLES,
+                 confidence: float = 0.95, seed: int = 0, workers: int = 1,
+                 batch_size: int = BATCH_SIZE, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.df = df
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.seed = seed
+        self.workers = workers
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self._cache: Dict[str, object] = {}
+
+    def correlate(self, x_cols: List[str], y_cols: List[str],
+                  nan_policy: str = 'pairwise') -> Dict:
+        """Pearson r of every x column with every y column, with uncertainty.
+
+        Returns {'r', 'ci_low', 'ci_high', 'p_perm'} DataFrames indexed by x
+        and columned by y. Intervals are bootstrap percentiles; p_perm is
+        two-sided, permuting y rows against x.
+        """
+        if nan_policy not in ('pairwise', 'complete', 'zero'):
+            raise ValueError(f"Unsupported NaN policy for resampling: {nan_policy}")
+        x_cols = [col for col in dict.fromkeys(x_cols) if col in self.df.columns]
+        y_cols = [col for col in dict.fromkeys(y_cols) if col in self.df.columns]
+        x = self.df[x_cols].to_numpy(dtype=float)
+        y = self.df[y_cols].to_numpy(dtype=float)
+        if nan_policy == 'zero':
+            x, y = np.nan_to_num(x, nan=0.0), np.nan_to_num(y, nan=0.0)
+        elif nan_policy == 'complete':
+            complete = ~(np.isnan(x).any(axis=1) | np.isnan(y).any(axis=1))
+            x, y = x[complete], y[complete]
+
+        def compute():
+            observed = _pairwise_pearson(x, y)[0]
+            boot = self._resample(_bootstrap_correlations, (x, y), len(x), 'bootstrap')
+            perm = self._resample(_permuted_correlations, (x, y), len(x), 'permutation')
+            low, high = self._interval(boot)
+            frames = {
+                'r': observed, 'ci_low': low, 'ci_high': high,
+                'p_perm': _permutation_p_value(observed, perm)
+            }
+            return {
+                name: pd.DataFrame(values, index=x_cols, columns=y_cols)
+                for name, values in frames.items()
+            }
+
+        return self._cached(('correlate', x_cols, y_cols, nan_policy), (x, y), compute)
+
+    def anova(self, value_cols: List[str], group_col: str) -> pd.DataFrame:
+        """One-way ANOVA F across groups for each column, with uncertainty.
+
+        The interval comes from resampling within each group (group sizes are
+        kept); p_perm shuffles group labels across rows.
+        """
+        codes, groups = pd.factorize(self.df[group_col], sort=True)
+        values = self.df[value_cols].to_numpy(dtype=float)
+        strata = [np.flatnonzero(codes == i) for i in range(len(groups))]
+        data = (values, codes, len(groups))
+
+        def compute():
+            observed = _bootstrap_f(*data, np.arange(len(values))[None])[0]
+            boot = self._resample(_bootstrap_f, data, len(values), 'bootstrap', strata)
+            perm = self._resample(_permuted_f, data, len(values), 'permutation')
+            low, high = self._interval(boot)
+            return pd.DataFrame({
+                'f_statistic': observed, 'ci_low': low, 'ci_high': high,
+                'p_perm': _permutation_p_value(observed, perm, two_sided=False)
+            }, index=value_cols)
+
+        return self._cached(('anova', value_cols, group_col), (values, codes), compute)
+
+    def relative_deviation(self, cols: List[str], country: str,
+                           region: str) -> pd.DataFrame:
+        """Mean relative deviation of a country from its region's and the global mean.
+
+        The interval bootstraps the countries behind both means. p_perm is the
+        share of countries (the focal one included) whose own deviation from
+        the same means is at least as large, i.e. an exact permutation test
+        over which country is singled out.
+        """
+        values = self.df[cols].to_numpy(dtype=float)
+        focal = values[self.df['Country'].to_numpy() == country][0]
+        in_region = (self.df['region'] == region).to_numpy()
+        data = (values, in_region, focal)
+
+        def compute():
+            observed = _bootstrap_deviation(*data, np.arange(len(values))[None])[0]
+            boot = self._resample(_bootstrap_deviation, data, len(values), 'bootstrap')
+            low, high = self._interval(boot)
+
+            # Every country's deviation from the observed means, in one pass
+            region_mean = np.nanmean(values[in_region], axis=0)
+            global_mean = np.nanmean(values, axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                everyone = (np.abs(values - region_mean) / region_mean
+                            + np.abs(values - global_mean) / global_mean) / 2
+            valid = ~np.isnan(everyone)
+            extreme = (everyone >= observed - 1e-12) & valid
+            p_perm = extreme.sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+
+            return pd.DataFrame({
+                'score': observed, 'ci_low': low, 'ci_high': high,
+                'p_perm': np.where(np.isnan(observed), np.nan, p_perm)
+            }, index=cols)
+
+        return self._cached(('deviation', cols, country, region), data[:2], compute)
+
+    def clear(self) -> None:
+        """Drop memoized results (persisted results are keyed by data and kept)"""
+        self._cache.clear()
+
+    def _interval(self, samples: np.ndarray):
+        alpha = (1 - self.confidence) / 2
+        with np.errstate(invalid='ignore'):
+            low, high = np.nanpercentile(samples, [100 * alpha, 100 * (1 - alpha)], axis=0)
+        return low, high
+
+    def _resample(self, statistic: Callable, data: tuple, n_rows: int, kind: str,
+                  strata: Optional[List[np.ndarray]] = None) -> np.ndarray:
+        """Evaluate a statistic on n_resamples index matrices, batch by batch"""
+        batch_size = max(1, min(self.batch_size, MAX_BATCH_ROWS // max(n_rows, 1)))
+        sizes = [batch_size] * (self.n_resamples // batch_size)
+        if self.n_resamples % batch_size:
+            sizes.append(self.n_resamples % batch_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(statistic, data, kind, n_rows, size, strata, seed)
+                 for size, seed in zip(sizes, seeds)]
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+                batches = list(pool.map(_run_batch, *zip(*tasks)))
+        else:
+            batches = [_run_batch(*task) for task in tasks]
+        return np.concatenate(batches)
+
+    def _cached(self, spec: tuple, arrays: tuple, compute: Callable):
+        """Memoize and persist a result under a hash of its inputs and settings"""
+        digest = hashlib.sha1(repr((
+            spec, self.n_resamples, self.confidence, self.seed, self.batch_size
+        )).encode())
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        key = digest.hexdigest()
+
+        if key in self._cache:
+            return self._cache[key]
+        path = os.path.join(self.cache_dir, f'{key}.pkl') if self.cache_dir else None
+        if path and os.path.exists(path):
+            result = pd.read_pickle(path)
+        else:
+            result = compute()
+            if path:
+                write_pickle(path, result)
+        self._cache[key] = result
+        return result
+
+
+def _run_batch(statistic: Callable, data: tuple, kind: str, n_rows: int, size: int,
+               strata: Optional[List[np.ndarray]], seed: np.random.SeedSequence) -> np.ndarray:
+    """Draw one batch of index matrices and evaluate a statistic on it"""
+    rng = np.random.default_rng(seed)
+    if kind == 'permutation':
+        indices = rng.permuted(np.tile(np.arange(n_rows), (size, 1)), axis=1)
+    elif strata is not None:
+        # Resample within each stratum so every row keeps its stratum
+        indices = np.empty((size, n_rows), dtype=int)
+        for rows in strata:
+            indices[:, rows] = rows[rng.integers(0, len(rows), (size, len(rows)))]
+    else:
+        indices = rng.integers(0, n_rows, (size, n_rows))
+    return statistic(*data, indices)
+
+
+def _bootstrap_correlations(x: np.ndarray, y: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    return _pairwise_pearson(x[indices], y[indices])[0]
+
+
+def _permuted_correlations(x: np.ndarray, y: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    return _pairwise_pearson(x[None], y[indices])[0]
+
+
+def _f_statistics(values: np.ndarray, membership: np.ndarray) -> np.ndarray:
+    """One-way ANOVA F per column for (batch, rows, columns) values and one-hot groups"""
+    counts = membership.sum(axis=-2)
+    means = np.swapaxes(membership, -1, -2) @ values / counts[..., None]
+    grand = values.mean(axis=-2, keepdims=True)
+    between = (counts[..., None] * (means - grand) ** 2).sum(axis=-2)
+    within = ((values - grand) ** 2).sum(axis=-2) - between
+    dof_between = (counts > 0).sum(axis=-1, keepdims=True) - 1
+    dof_within = values.shape[-2] - dof_between - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (between / dof_between) / (within / dof_within)
+
+
+def _bootstrap_f(values: np.ndarray, codes: np.ndarray, n_groups: int,
+                 indices: np.ndarray) -> np.ndarray:
+    # Stratified indices keep each row's group, so membership is fixed
+    membership = np.eye(n_groups)[codes][None]
+    return _f_statistics(values[indices], membership)
+
+
+def _permuted_f(values: np.ndarray, codes: np.ndarray, n_groups: int,
+                indices: np.ndarray) -> np.ndarray:
+    return _f_statistics(values[None], np.eye(n_groups)[codes[indices]])
+
+
+def _bootstrap_deviation(values: np.ndarray, in_region: np.ndarray, focal: np.ndarray,
+                         indices: np.ndarray) -> np.ndarray:
+    sample = values[indices]
+    present = ~np.isnan(sample)
+    sample = np.where(present, sample, 0.0)
+    region = in_region[indices][..., None] & present
+    with np.errstate(divide='ignore', invalid='ignore'):
+        region_mean = (sample * region).sum(axis=1) / region.sum(axis=1)
+        global_mean = sample.sum(axis=1) / present.sum(axis=1)
+        return (np.abs(focal - region_mean) / region_mean
+                + np.abs(focal - global_mean) / global_mean) / 2
+
+
+def _permutation_p_value(observed: np.ndarray, permuted: np.ndarray,
+                         two_sided: bool = True) -> np.ndarray:
+    """(1 + #resamples at least as extreme) / (1 + #resamples)"""
+    if two_sided:
+        observed, permuted = np.abs(observed), np.abs(permuted)
+    # Small tolerance so exact ties with the observed value count as extreme
+    extreme = (permuted >= observed - 1e-12).sum(axis=0)
+    p = (1 + extreme) / (1 + len(permuted))
+    return np.where(np.isnan(observed), np.nan, p)
+
+
+def get_resampling_engine(df: pd.DataFrame) -> ResamplingEngine:
+    """Get the shared engine for a DataFrame so analyzers reuse each other's results"""
+    return shared_engine('resampling', df, ResamplingEngine)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from utils.data_loader import DEFAULT_DATA_PATH, load_data
+    from analysis.regional.cross_regional import CrossRegionalAnalyzer
+    from analysis.singapore_focus.recommendations import RecommendationEngine
+
+    parser = argparse.ArgumentParser(
+        description='Precompute resampled intervals so live requests read them from disk'
+    )
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    options = parser.parse_args(args)
+
+    df = load_data(options.data)
+    # Engines are shared by name, so the analyzers below use this engine even
+    # though this module runs as __main__
+    engine = get_resampling_engine(df)
+    engine.workers = options.workers
+    CrossRegionalAnalyzer(df).analyze_cross_regional_patterns()
+    RecommendationEngine(df).generate_recommendations()
+    # Intervals served by /api/viz/music-wellbeing-correlation?intervals=true
+    engine.correlate(
+        RecommendationEngine(df).music_features,
+        [col for col in df.columns if 'Average' in col and 'Score' in col]
+    )
+    print(f"Cached {len(engine._cache)} resampled results in {engine.cache_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import weakref
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+PROFILES = {
+    'music': [
+        'tempo', 'energy', 'valence', 'danceability',
+        'loudness', 'speechiness', 'acousticness',
+        'instrumentalness', 'liveness'
+    ],
+    'wellbeing': [
+        'Life Ladder', 'Average MHQ Score', 'Average Cognition Score',
+        'Average Adaptability & Resilence Score',
+        'Average Drive & Motivation Score',
+        'Average Mood & Outlook Score',
+        'Average Social Self Score',
+        'Average Mind-Body Connection Score'
+    ]
+}
+PROFILES['combined'] = PROFILES['music'] + PROFILES['wellbeing']
+
+METRICS = ('euclidean', 'cosine', 'mahalanobis', 'weighted')
+
+# Above this many entities, a KD-tree replaces the all-pairs distance matrix
+BRUTE_FORCE_LIMIT = 2000
+
+class SimilarityIndex:
+    """k-nearest-neighbour index over standardized entity profiles.
+
+    Columns are z-scored once at build time. Every metric is reduced to
+    euclidean distance in a transformed space (scaled for weighted, whitened
+    for Mahalanobis, unit-normalized for cosine), so small datasets get a
+    precomputed all-pairs distance matrix and large ones a KD-tree.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: List[str], metric: str = 'euclidean',
+                 weights: Optional[Dict[str, float]] = None, id_col: str = 'Country',
+                 brute_force_limit: int = BRUTE_FORCE_LIMIT):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}; expected one of {METRICS}")
+        unknown = [col for col in (weights or {}) if col not in columns]
+        if unknown:
+            raise ValueError(f"Weights given for columns outside the profile: {unknown}")
+        invalid = [col for col, weight in (weights or {}).items()
+                   if not (np.isfinite(weight) and weight >= 0)]
+        if invalid:
+            raise ValueError(f"Weights must be finite and non-negative: {invalid}")
+
+        # Weak, so shared indexes can tell when their frame has been collected
+        self.df_ref = weakref.ref(df)
+        data = df.drop_duplicates(id_col)
+        self.ids = data[id_col].tolist()
+        self.positions = {entity: i for i, entity in enumerate(self.ids)}
+        self.columns = [col for col in columns if col in df.columns]
+        self.metric = metric
+
+        values = data[self.columns].to_numpy(dtype=float)
+        self.mean = np.nanmean(values, axis=0)
+        self.std = np.nanstd(values, axis=0, ddof=1)
+        self.std[~(self.std > 0)] = 1.0
+        standardized = self._standardize(values)
+
+        self._scale = np.ones(len(self.columns))
+        if metric == 'weighted':
+            self._scale = np.sqrt([float((weights or {}).get(col, 1.0)) for col in self.columns])
+        self._whitening = None
+        if metric == 'mahalanobis':
+            eigenvalues, eigenvectors = np.linalg.eigh(np.cov(standardized, rowvar=False))
+            keep = eigenvalues > 1e-10 * eigenvalues.max()
+            self._whitening = eigenvectors[:, keep] / np.sqrt(eigenvalues[keep])
+
+        self.points = self._transform(standardized)
+        if len(self.ids) <= brute_force_limit:
+            self.distances = self._to_metric(_euclidean_matrix(self.points, self.points))
+            self.tree = None
+        else:
+            from scipy.spatial import cKDTree
+            self.distances = None
+            self.tree = cKDTree(self.points)
+
+    def kneighbors(self, entities: List[str], k: int = 5) -> Dict[str, Dict[str, float]]:
+        """Nearest neighbours for known entities, excluding each entity itself"""
+        missing = [entity for entity in entities if entity not in self.positions]
+        if missing:
+            raise KeyError(f"Unknown entities: {missing}")
+
+        positions = np.array([self.positions[entity] for entity in entities], dtype=int)
+        neighbors, distances = self._search(self.points[positions], k, exclude=positions)
+        return {
+            entity: self._format(neighbors[i], distances[i])
+            for i, entity in enumerate(entities)
+        }
+
+    def query(self, vectors: List[Dict[str, float]], k: int = 5) -> List[Dict[str, float]]:
+        """Nearest neighbours for ad-hoc profiles given in raw column units.
+
+        Columns missing from a vector are treated as the dataset mean.
+        """
+        invalid = [col for vector in vectors for col, value in vector.items()
+                   if not np.isfinite(value)]
+        if invalid:
+            raise ValueError(f"Vector values must be finite: {invalid}")
+        values = np.array([
+            [float(vector.get(col, mean)) for col, mean in zip(self.columns, self.mean)]
+            for vector in vectors
+        ])
+        points = self._transform(self._standardize(values))
+        neighbors, distances = self._search(points, k)
+        return [self._format(neighbors[i], distances[i]) for i in range(len(vectors))]
+
+    def _standardize(self, values: np.ndarray) -> np.ndarray:
+        return np.nan_to_num((values - self.mean) / self.std)
+
+    def _transform(self, standardized: np.ndarray) -> np.ndarray:
+        points = standardized * self._scale
+        if self._whitening is not None:
+            points = points @ self._whitening
+        if self.metric == 'cosine':
+            norms = np.linalg.norm(points, axis=1, keepdims=True)
+            points = np.divide(points, norms, out=np.zeros_like(points), where=norms > 0)
+        return points
+
+    def _to_metric(self, euclidean: np.ndarray) -> np.ndarray:
+        # For unit vectors, 1 - cos(a, b) == |a - b|^2 / 2
+        return euclidean ** 2 / 2 if self.metric == 'cosine' else euclidean
+
+    def _search(self, points: np.ndarray, k: int, exclude: Optional[np.ndarray] = None):
+        """Batch k-NN returning neighbour positions and distances, nearest first"""
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        k = max(0, min(k, len(self.ids) - (1 if exclude is not None else 0)))
+        if k == 0:
+            return np.empty((len(points), 0), dtype=int), np.empty((len(points), 0))
+
+        if self.tree is None:
+            if exclude is not None:
+                distances = self.distances[exclude].copy()
+                distances[np.arange(len(exclude)), exclude] = np.inf
+            else:
+                distances = self._to_metric(_euclidean_matrix(points, self.points))
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            nearest_dist = np.take_along_axis(distances, nearest, axis=1)
+            order = np.argsort(nearest_dist, axis=1, kind='stable')
+            return (np.take_along_axis(nearest, order, axis=1),
+                    np.take_along_axis(nearest_dist, order, axis=1))
+
+        # Ask for one extra neighbour so self can be dropped
+        extra = 1 if exclude is not None else 0
+        distances, nearest = self.tree.query(points, k=k + extra)
+        distances = distances.reshape(len(points), -1)
+        nearest = nearest.reshape(len(points), -1)
+        if exclude is not None:
+            keep = nearest != exclude[:, None]
+            # Rows where self was not returned drop their farthest hit instead
+            keep[keep.all(axis=1), -1] = False
+            nearest = nearest[keep].reshape(len(points), k)
+            distances = distances[keep].reshape(len(points), k)
+        return nearest, self._to_metric(distances)
+
+    def _format(self, neighbors: np.ndarray, distances: np.ndarray) -> Dict[str, float]:
+        return {self.ids[i]: float(d) for i, d in zip(neighbors, distances)}
+
+
+def _euclidean_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """All-pairs euclidean distances via |a|^2 + |b|^2 - 2ab"""
+    squared = (
+        np.sum(a ** 2, axis=1)[:, None]
+        + np.sum(b ** 2, axis=1)[None, :]
+        - 2 * a @ b.T
+    )
+    return np.sqrt(np.clip(squared, 0, None))
+
+
+# Held strongly (nothing else keeps an index alive between requests). Entries
+# for collected DataFrames are pruned on insert, and since weights come from
+# query strings only the most recent MAX_INDEXES are kept.
+MAX_INDEXES = 32
+_indexes: Dict[tuple, SimilarityIndex] = {}
+
+def get_similarity_index(df: pd.DataFrame, profile: str = 'music', metric: str = 'euclidean',
+                         weights: Optional[Dict[str, float]] = None) -> SimilarityIndex:
+    """Get a shared index for a DataFrame, profile, metric and weights"""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile: {profile}; expected one of {tuple(PROFILES)}")
+
+    key = (id(df), profile, metric, tuple(sorted((weights or {}).items())))
+    index = _indexes.get(key)
+    if index is None or index.df_ref() is not df:
+        index = SimilarityIndex(df, PROFILES[profile], metric=metric, weights=weights)
+        for stale in [k for k, v in _indexes.items() if v.df_ref() is None]:
+            del _indexes[stale]
+        while len(_indexes) >= MAX_INDEXES:
+            del _indexes[next(iter(_indexes))]
+        _indexes[key] = index
+    return index
@@ -1,7 +1,6 @@
-import pandas as pd
-import numpy as np
-from scipy import stats
-from typing import Dict, List, Tuple
+from typing import Dict, List
+from analysis.comparative_engine import get_comparative_engine
+from analysis.correlation_engine import get_correlation_engine
 
 class SingaporeComparative:
     def __init__(self, df):
@@ -32,14 +31,16 @@ class SingaporeComparative:
         self.music_features = ['tempo', 'energy', 'valence', 'danceability', 
                              'loudness', 'speechiness', 'acousticness', 
                              'instrumentalness', 'liveness']
+        self.correlations = get_correlation_engine(df)
+        self.comparative = get_comparative_engine(df)
 
     def analyze_demographic_position(self) -> Dict:
         """Compare Singapore's demographic patterns globally and regionally"""
         results = {}
         for category, cols in self.demographic_cols.items():
             results[category] = {
-                'global_percentiles': self._calculate_percentiles(cols, self.df),
-                'asia_percentiles': self._calculate_percentiles(cols, self.asia_data),
+                'global_percentiles': self._calculate_percentiles(cols, 'global'),
+                'asia_percentiles': self._calculate_percentiles(cols, 'region'),
                 'distribution': self._get_distribution_stats(cols)
             }
         return results
@@ -57,32 +58,29 @@ class SingaporeComparative:
         """Compare Singapore's music consumption patterns"""
         return {
             'feature_percentiles': self._calculate_percentiles(
-                self.music_features, self.df),
+                self.music_features, 'global'),
             'asia_comparison': self._compare_with_asia(),
             'genre_analysis': self._analyze_genre_patterns()
         }
 
-    def _calculate_percentiles(self, cols: List[str], 
-                             comparison_df: pd.DataFrame) -> Dict:
-        """Calculate percentile ranks for Singapore"""
-        percentiles = {}
-        for col in cols:
-            sg_value = self.singapore_data[col].iloc[0]
-            percentiles[col] = stats.percentileofscore(comparison_df[col], sg_value)
-        return percentiles
+    def _calculate_percentiles(self, cols: List[str], scope: str) -> Dict:
+        """Singapore's percentile ranks, globally or within Asia ('global' or 'region')"""
+        position = self.comparative.position('Singapore', cols)
+        return position[f'{scope}_percentile'].to_dict()
 
     def _get_distribution_stats(self, cols: List[str]) -> Dict:
         """Get distribution statistics for comparison"""
-        stats_dict = {}
-        for col in cols:
-            stats_dict[col] = {
-                'singapore': self.singapore_data[col].iloc[0],
-                'asia_mean': self.asia_data[col].mean(),
-                'asia_std': self.asia_data[col].std(),
-                'global_mean': self.df[col].mean(),
-                'global_std': self.df[col].std()
+        position = self.comparative.position('Singapore', cols)
+        return {
+            col: {
+                'singapore': row['value'],
+                'asia_mean': row['region_mean'],
+                'asia_std': row['region_std'],
+                'global_mean': row['global_mean'],
+                'global_std': row['global_std']
             }
-        return stats_dict
+            for col, row in position.iterrows()
+        }
 
     def _analyze_wellbeing_categories(self) -> Dict:
         """Analyze well-being category distributions"""
@@ -90,8 +88,8 @@ class SingaporeComparative:
         return {
             'distributions': self._get_distribution_stats(categories),
             'percentiles': {
-                'global': self._calculate_percentiles(categories, self.df),
-                'asia': self._calculate_percentiles(categories, self.asia_data)
+                'global': self._calculate_percentiles(categories, 'global'),
+                'asia': self._calculate_percentiles(categories, 'region')
             }
         }
 
@@ -101,21 +99,19 @@ class SingaporeComparative:
         return {
             'scores': self._get_distribution_stats(scores),
             'percentiles': {
-                'global': self._calculate_percentiles(scores, self.df),
-                'asia': self._calculate_percentiles(scores, self.asia_data)
+                'global': self._calculate_percentiles(scores, 'global'),
+                'asia': self._calculate_percentiles(scores, 'region')
             }
         }
 
     def _compare_with_asia(self) -> Dict:
         """Compare music features with Asian countries"""
+        asia_correlations = self.correlations.correlate(
+            self.music_features, ['Average MHQ Score'], group_by='region'
+        )['Asia']['r']['Average MHQ Score']
         return {
             'features': self._get_distribution_stats(self.music_features),
-            'correlations': {
-                feature: np.corrcoef(
-                    self.asia_data[feature], 
-                    self.asia_data['Average MHQ Score']
-                )[0,1] for feature in self.music_features
-            }
+            'correlations': asia_correlations.to_dict()
         }
 
     def _analyze_genre_patterns(self) -> Dict:
@@ -128,15 +124,13 @@ class SingaporeComparative:
 
     def _get_regional_context(self) -> Dict:
         """Get broader regional context for well-being metrics"""
+        position = self.comparative.position('Singapore', self.wellbeing_cols['mhq_scores'])
         return {
             'asia_profile': {
                 score: {
-                    'mean': self.asia_data[score].mean(),
-                    'std': self.asia_data[score].std(),
-                    'singapore_zscore': (
-                        self.singapore_data[score].iloc[0] - 
-                        self.asia_data[score].mean()
-                    ) / self.asia_data[score].std()
-                } for score in self.wellbeing_cols['mhq_scores']
+                    'mean': row['region_mean'],
+                    'std': row['region_std'],
+                    'singapore_zscore': row['region_zscore']
+                } for score, row in position.iterrows()
             }
         } 
\ No newline at end of file
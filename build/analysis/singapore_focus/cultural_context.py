@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
 from typing import Dict, List, Tuple
+from analysis.comparative_engine import get_comparative_engine
+from analysis.correlation_engine import get_correlation_engine
 
 class CulturalContextAnalyzer:
     def __init__(self, df):
@@ -28,6 +29,8 @@ class CulturalContextAnalyzer:
             '% Distressed', '% Struggling', '% Enduring',
             '% Managing', '% Succeeding', '% Thriving'
         ]
+        self.correlations = get_correlation_engine(df)
+        self.comparative = get_comparative_engine(df)
 
     def analyze_cultural_influences(self) -> Dict:
         """Analyze cultural influences on music and well-being"""
@@ -39,23 +42,17 @@ class CulturalContextAnalyzer:
 
     def _get_cultural_metrics(self) -> Dict:
         """Compare Singapore's cultural indicators with regional/global"""
-        metrics = {}
-        for indicator in self.cultural_indicators:
-            if pd.notna(self.singapore_data[indicator].iloc[0]):
-                metrics[indicator] = {
-                    'singapore': self.singapore_data[indicator].iloc[0],
-                    'asia_mean': self.asia_data[indicator].mean(),
-                    'global_mean': self.df[indicator].mean(),
-                    'percentile_asia': stats.percentileofscore(
-                        self.asia_data[indicator].dropna(), 
-                        self.singapore_data[indicator].iloc[0]
-                    ),
-                    'percentile_global': stats.percentileofscore(
-                        self.df[indicator].dropna(), 
-                        self.singapore_data[indicator].iloc[0]
-                    )
-                }
-        return metrics
+        position = self.comparative.position('Singapore', self.cultural_indicators)
+        return {
+            indicator: {
+                'singapore': row['value'],
+                'asia_mean': row['region_mean'],
+                'global_mean': row['global_mean'],
+                'percentile_asia': row['region_percentile'],
+                'percentile_global': row['global_percentile']
+            }
+            for indicator, row in position.iterrows() if pd.notna(row['value'])
+        }
 
     def _analyze_music_cultural_patterns(self) -> Dict:
         """Analyze cultural influences on music preferences"""
@@ -68,17 +65,13 @@ class CulturalContextAnalyzer:
             'feature_cultural_alignment': {}
         }
         
-        for feature in self.music_features[:-1]:  # Exclude track_genre
+        # Exclude track_genre
+        position = self.comparative.position('Singapore', self.music_features[:-1])
+        for feature, row in position.iterrows():
             patterns['feature_cultural_alignment'][feature] = {
-                'singapore_value': self.singapore_data[feature].iloc[0],
-                'asia_similarity': 1 - abs(
-                    self.singapore_data[feature].iloc[0] - 
-                    self.asia_data[feature].mean()
-                ) / self.asia_data[feature].std(),
-                'global_similarity': 1 - abs(
-                    self.singapore_data[feature].iloc[0] - 
-                    self.df[feature].mean()
-                ) / self.df[feature].std()
+                'singapore_value': row['value'],
+                'asia_similarity': 1 - abs(row['region_zscore']),
+                'global_similarity': 1 - abs(row['global_zscore'])
             }
         
         return patterns
@@ -91,23 +84,26 @@ class CulturalContextAnalyzer:
         }
         
         # Analyze well-being category distributions
-        for category in self.wellbeing_cats:
+        position = self.comparative.position('Singapore', self.wellbeing_cats)
+        for category, row in position.iterrows():
             context['category_distributions'][category] = {
-                'singapore': self.singapore_data[category].iloc[0],
-                'asia_mean': self.asia_data[category].mean(),
-                'global_mean': self.df[category].mean()
+                'singapore': row['value'],
+                'asia_mean': row['region_mean'],
+                'global_mean': row['global_mean']
             }
         
         # Analyze correlations with cultural indicators
+        global_corr = self.correlations.correlate(
+            self.cultural_indicators, ['Average MHQ Score']
+        )['r']['Average MHQ Score']
+        asia_corr = self.correlations.correlate(
+            self.cultural_indicators, ['Average MHQ Score'], group_by='region'
+        )['Asia']['r']['Average MHQ Score']
         for indicator in self.cultural_indicators:
             if pd.notna(self.singapore_data[indicator].iloc[0]):
                 context['cultural_correlations'][indicator] = {
-                    'asia': self.asia_data[indicator].corr(
-                        self.asia_data['Average MHQ Score']
-                    ),
-                    'global': self.df[indicator].corr(
-                        self.df['Average MHQ Score']
-                    )
+                    'asia': asia_corr[indicator],
+                    'global': global_corr[indicator]
                 }
         
         return context 
\ No newline at end of file
@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
 from typing import Dict, List, Tuple
+from analysis.comparative_engine import get_comparative_engine
+from analysis.correlation_engine import get_correlation_engine, nested_dict
+from analysis.resampling import get_resampling_engine
 
 class RecommendationEngine:
     def __init__(self, df):
@@ -23,6 +25,9 @@ class RecommendationEngine:
             'Average Social Self Score',
             'Average Mind-Body Connection Score'
         ]
+        self.correlations = get_correlation_engine(df)
+        self.resampling = get_resampling_engine(df)
+        self.comparative = get_comparative_engine(df)
 
     def generate_recommendations(self) -> Dict:
         """Generate comprehensive recommendations"""
@@ -38,18 +43,8 @@ class RecommendationEngine:
 
     def _music_based_recommendations(self) -> Dict:
         """Generate music-based intervention recommendations"""
-        feature_impacts = {}
-        for feature in self.music_features:
-            if feature in self.df.columns:
-                correlations = {
-                    str(metric): float(stats.pearsonr(
-                        self.df[feature].fillna(0),
-                        self.df[metric].fillna(0)
-                    )[0]) for metric in self.wellbeing_metrics
-                    if metric in self.df.columns
-                }
-                feature_impacts[str(feature)] = correlations
-        
+        feature_impacts = nested_dict(self._feature_metric_correlations())
+
         return {
             'optimal_features': feature_impacts,
             'genre_recommendations': self._analyze_genre_effectiveness(),
@@ -76,19 +71,19 @@ class RecommendationEngine:
     def _calculate_feature_targets(self) -> Dict:
         """Calculate optimal targets for music features"""
         targets = {}
-        for feature in self.music_features:
-            if feature in self.df.columns:
-                high_wellbeing = self.df[
-                    self.df['Average MHQ Score'] > self.df['Average MHQ Score'].mean()
-                ]
-                targets[str(feature)] = {
-                    'optimal_range': {
-                        'min': float(high_wellbeing[feature].quantile(0.25)),
-                        'max': float(high_wellbeing[feature].quantile(0.75))
-                    },
-                    'current_singapore': float(self.singapore_data[feature].iloc[0]),
-                    'asia_average': float(self.asia_data[feature].mean())
-                }
+        position = self.comparative.position('Singapore', self.music_features)
+        for feature, row in position.iterrows():
+            high_wellbeing = self.df[
+                self.df['Average MHQ Score'] > self.df['Average MHQ Score'].mean()
+            ]
+            targets[str(feature)] = {
+                'optimal_range': {
+                    'min': float(high_wellbeing[feature].quantile(0.25)),
+                    'max': float(high_wellbeing[feature].quantile(0.75))
+                },
+                'current_singapore': float(row['value']),
+                'asia_average': float(row['region_mean'])
+            }
         return targets
 
     def _demographic_recommendations(self) -> Dict:
@@ -104,15 +99,21 @@ class RecommendationEngine:
 
         recommendations = {}
         for category, groups in demographic_groups.items():
+            position = self.comparative.position('Singapore', groups)
+            groups = position.index.tolist()
+            # Uncertainty of each priority score (see _calculate_priority_score)
+            deviation = self.resampling.relative_deviation(groups, 'Singapore', 'Asia')
             group_scores = {}
-            for group in groups:
-                if group in self.singapore_data.columns:
-                    group_scores[str(group)] = {
-                        'current_level': float(self.singapore_data[group].iloc[0]),
-                        'asia_benchmark': float(self.asia_data[group].mean()),
-                        'global_benchmark': float(self.df[group].mean()),
-                        'priority_score': float(self._calculate_priority_score(group))
-                    }
+            for group, row in position.iterrows():
+                group_scores[str(group)] = {
+                    'current_level': float(row['value']),
+                    'asia_benchmark': float(row['region_mean']),
+                    'global_benchmark': float(row['global_mean']),
+                    'priority_score': float(self._calculate_priority_score(group)),
+                    'ci_low': float(deviation.at[group, 'ci_low']),
+                    'ci_high': float(deviation.at[group, 'ci_high']),
+                    'p_perm': float(deviation.at[group, 'p_perm'])
+                }
             recommendations[str(category)] = group_scores
         return recommendations
 
@@ -151,9 +152,10 @@ class RecommendationEngine:
         if group not in self.singapore_data.columns:
             return 0.0
             
-        singapore_value = self.singapore_data[group].iloc[0]
-        asia_mean = self.asia_data[group].mean()
-        global_mean = self.df[group].mean()
+        row = self.comparative.position('Singapore', [group]).loc[group]
+        singapore_value = row['value']
+        asia_mean = row['region_mean']
+        global_mean = row['global_mean']
         
         deviation_from_asia = abs(singapore_value - asia_mean) / asia_mean
         deviation_from_global = abs(singapore_value - global_mean) / global_mean
@@ -195,14 +197,13 @@ class RecommendationEngine:
                 },
                 'feature_similarity': {
                     str(feature): {
-                        'singapore_value': float(self.singapore_data[feature].iloc[0]),
-                        'asia_mean': float(asia_data[feature].mean()),
-                        'similarity_score': float(1 - abs(
-                            self.singapore_data[feature].iloc[0] - asia_data[feature].mean()
-                        ) / asia_data[feature].std())
+                        'singapore_value': float(row['value']),
+                        'asia_mean': float(row['region_mean']),
+                        'similarity_score': float(1 - abs(row['region_zscore']))
                     }
-                    for feature in self.music_features
-                    if feature in self.singapore_data.columns
+                    for feature, row in self.comparative.position(
+                        'Singapore', self.music_features
+                    ).iterrows()
                 }
             }
         except Exception as e:
@@ -211,27 +212,25 @@ class RecommendationEngine:
     def _identify_priority_dimensions(self) -> Dict:
         """Identify priority dimensions for intervention"""
         try:
-            singapore = self.df[self.df['Country'] == 'Singapore']
-            asia = self.df[self.df['region'] == 'Asia']
-            
+            position = self.comparative.position('Singapore', self.wellbeing_metrics)
+
             priority_scores = {}
-            for dimension in self.wellbeing_metrics:
-                if dimension in singapore.columns:
-                    sg_value = float(singapore[dimension].iloc[0])
-                    asia_mean = float(asia[dimension].mean())
-                    global_mean = float(self.df[dimension].mean())
-                    
-                    # Calculate gap from regional and global means
-                    asia_gap = (asia_mean - sg_value) / asia_mean
-                    global_gap = (global_mean - sg_value) / global_mean
-                    
-                    priority_scores[str(dimension)] = {
-                        'current_value': sg_value,
-                        'asia_mean': asia_mean,
-                        'global_mean': global_mean,
-                        'gap_score': float((asia_gap + global_gap) / 2),
-                        'priority_level': 'high' if abs(asia_gap) > 0.1 else 'medium' if abs(asia_gap) > 0.05 else 'low'
-                    }
+            for dimension, row in position.iterrows():
+                sg_value = float(row['value'])
+                asia_mean = float(row['region_mean'])
+                global_mean = float(row['global_mean'])
+
+                # Calculate gap from regional and global means
+                asia_gap = (asia_mean - sg_value) / asia_mean
+                global_gap = (global_mean - sg_value) / global_mean
+
+                priority_scores[str(dimension)] = {
+                    'current_value': sg_value,
+                    'asia_mean': asia_mean,
+                    'global_mean': global_mean,
+                    'gap_score': float((asia_gap + global_gap) / 2),
+                    'priority_level': 'high' if abs(asia_gap) > 0.1 else 'medium' if abs(asia_gap) > 0.05 else 'low'
+                }
             
             return priority_scores
         except Exception as e:
@@ -241,40 +240,48 @@ class RecommendationEngine:
         """Calculate specific intervention targets"""
         try:
             targets = {}
-            for metric in self.wellbeing_metrics:
-                if metric in self.df.columns:
-                    high_performing = self.df[self.df[metric] > self.df[metric].quantile(0.75)]
-                    
-                    targets[str(metric)] = {
-                        'target_value': float(high_performing[metric].mean()),
-                        'current_value': float(self.singapore_data[metric].iloc[0]),
-                        'improvement_required': float(
-                            high_performing[metric].mean() - self.singapore_data[metric].iloc[0]
-                        ),
-                        'associated_features': self._identify_associated_features(metric)
-                    }
-            
+            position = self.comparative.position('Singapore', self.wellbeing_metrics)
+            for metric, row in position.iterrows():
+                high_performing = self.df[self.df[metric] > row['global_q75']]
+
+                targets[str(metric)] = {
+                    'target_value': float(high_performing[metric].mean()),
+                    'current_value': float(row['value']),
+                    'improvement_required': float(
+                        high_performing[metric].mean() - row['value']
+                    ),
+                    'associated_features': self._identify_associated_features(metric)
+                }
+
             return targets
         except Exception as e:
             return {'error': str(e)}
 
+    def _feature_metric_correlations(self) -> pd.DataFrame:
+        """Feature x metric correlations with missing values treated as 0"""
+        return self.correlations.correlate(
+            self.music_features, self.wellbeing_metrics, nan_policy='zero'
+        )['r']
+
     def _identify_associated_features(self, metric: str) -> Dict:
         """Identify music features most associated with a wellbeing metric"""
         try:
+            intervals = self.resampling.correlate(
+                self.music_features, self.wellbeing_metrics, nan_policy='zero'
+            )
             correlations = {}
-            for feature in self.music_features:
-                if feature in self.df.columns:
-                    correlation = float(stats.pearsonr(
-                        self.df[feature].fillna(0),
-                        self.df[metric].fillna(0)
-                    )[0])
-                    
-                    correlations[str(feature)] = {
-                        'correlation': correlation,
-                        'impact_level': 'high' if abs(correlation) > 0.5 else 
-                                      'medium' if abs(correlation) > 0.3 else 'low'
-                    }
-            
+            for feature, correlation in self._feature_metric_correlations()[metric].items():
+                correlation = float(correlation)
+
+                correlations[str(feature)] = {
+                    'correlation': correlation,
+                    'ci_low': float(intervals['ci_low'].at[feature, metric]),
+                    'ci_high': float(intervals['ci_high'].at[feature, metric]),
+                    'p_perm': float(intervals['p_perm'].at[feature, metric]),
+                    'impact_level': 'high' if abs(correlation) > 0.5 else
+                                  'medium' if abs(correlation) > 0.3 else 'low'
+                }
+
             return correlations
         except Exception as e:
             return {'error': str(e)}
@@ -282,26 +289,26 @@ class RecommendationEngine:
     def _define_success_metrics(self) -> Dict:
         """Define metrics to measure intervention success"""
         try:
+            metrics = self.comparative.position('Singapore', self.wellbeing_metrics)
+            features = self.comparative.position('Singapore', self.music_features)
             return {
                 'primary_metrics': {
                     str(metric): {
-                        'baseline': float(self.singapore_data[metric].iloc[0]),
-                        'target': float(self.df[metric].quantile(0.75)),
+                        'baseline': float(row['value']),
+                        'target': float(row['global_q75']),
                         'measurement_frequency': 'quarterly'
                     }
-                    for metric in self.wellbeing_metrics
-                    if metric in self.singapore_data.columns
+                    for metric, row in metrics.iterrows()
                 },
                 'secondary_metrics': {
                     str(feature): {
-                        'baseline': float(self.singapore_data[feature].iloc[0]),
+                        'baseline': float(row['value']),
                         'optimal_range': {
-                            'min': float(self.df[feature].quantile(0.25)),
-                            'max': float(self.df[feature].quantile(0.75))
+                            'min': float(row['global_q25']),
+                            'max': float(row['global_q75'])
                         }
                     }
-                    for feature in self.music_features
-                    if feature in self.singapore_data.columns
+                    for feature, row in features.iterrows()
                 }
             }
         except Exception as e:
@@ -0,0 +1,262 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+from utils.data_loader import DEFAULT_DATA_PATH
+
+SCALES = [1, 10, 100, 10_000]
+DEFAULT_REPEAT = 5
+PERCENTILES = (50, 90, 95, 99)
+
+# Query strings timed for routes whose work depends on them
+ROUTE_QUERIES = {
+    '/api/viz/wellbeing-dimensions': ['', 'layout=columnar'],
+    '/api/viz/music-features': ['', 'layout=columnar'],
+    '/api/viz/music-wellbeing-correlation': ['', 'layout=columnar', 'intervals=true'],
+    '/api/viz/mental-health': ['', 'layout=columnar'],
+    '/api/viz/scatter': ['feature=energy&metric=Life+Ladder'],
+    '/api/similar': ['country=Singapore&k=10',
+                     'country=Singapore&k=10&profile=combined&metric=mahalanobis'],
+}
+
+# Routes not timed: /api/metrics only reports on the others
+SKIPPED_ROUTES = {'/api/metrics'}
+
+
+def route_urls(app_module) -> List[str]:
+    """Every /api/ URL to time, expanding path arguments and query variants"""
+    from analysis.registry import ANALYZERS
+
+    route_arguments = {
+        '/api/analysis/<analyzer>/<method>': [
+            {'analyzer': name, 'method': method}
+            for name, spec in ANALYZERS.items() for method in spec['methods']
+        ],
+        '/api/country/<name>/comparative': [{'name': 'Singapore'}],
+    }
+
+    adapter = app_module.app.server.url_map.bind('localhost')
+    urls = []
+    for rule in sorted(app_module.app.server.url_map.iter_rules(), key=lambda r: r.rule):
+        if not rule.rule.startswith('/api/') or rule.rule in SKIPPED_ROUTES:
+            continue
+        for values in route_arguments.get(rule.rule, [{}]):
+            path = adapter.build(rule.endpoint, values)
+            for query in ROUTE_QUERIES.get(rule.rule, ['']):
+                urls.append(f'{path}?{query}' if query else path)
+    return urls
+
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """Latency percentiles, mean and range in milliseconds"""
+    summary = {f'p{p}': float(np.percentile(samples_ms, p)) for p in PERCENTILES}
+    summary.update({
+        'mean': float(np.mean(samples_ms)),
+        'min': float(np.min(samples_ms)),
+        'max': float(np.max(samples_ms))
+    })
+    return summary
+
+
+def measure(call: Callable, repeat: int, reset: Callable) -> Dict:
+    """Time a call repeat times from cold caches, then once more for peak memory"""
+    samples = []
+    for _ in range(repeat):
+        reset()
+        started = time.perf_counter()
+        result = call()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    reset()
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'latency_ms': summarize(samples), 'peak_memory_bytes': peak, 'result': result}
+
+
+def benchmark_app(repeat: int, resamples: Optional[int] = None) -> Dict:
+    """Time every route and public analyzer method of main.py on DATA_PATH.
+
+    Resampling runs at the production setting unless resamples is given; every
+    entry records the setting it was timed with.
+    """
+    started = time.perf_counter()
+    import main as app_module
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    # Measure computation, not results persisted by earlier runs
+    app_module.analyzers.cache_dir = None
+    app_module.resampling.cache_dir = None
+    if resamples is not None:
+        app_module.resampling.n_resamples = resamples
+    resamples = app_module.resampling.n_resamples
+
+    from analysis import similarity_index
+
+    def reset():
+        similarity_index._indexes.clear()
+        app_module.snapshot.clear_responses()
+        app_module.correlations.clear()
+        app_module.resampling.clear()
+        app_module.comparative.clear()
+        app_module.analyzers.clear()
+
+    client = app_module.app.server.test_client()
+    routes = {}
+    for url in route_urls(app_module):
+        timing = measure(lambda: client.get(url), repeat, reset)
+        response = timing.pop('result')
+        cached = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            client.get(url)
+            cached.append((time.perf_counter() - started) * 1000)
+        routes[url] = dict(
+            timing, status=response.status_code, response_bytes=len(response.get_data()),
+            cached_latency_ms=summarize(cached), resamples=resamples
+        )
+
+    from analysis.registry import ANALYZERS
+    methods = {}
+    for name, spec in ANALYZERS.items():
+        started = time.perf_counter()
+        analyzer = app_module.analyzers.get(name)
+        construct_ms = (time.perf_counter() - started) * 1000
+        for method in spec['methods']:
+            timing = measure(getattr(analyzer, method), repeat, reset)
+            result = timing.pop('result')
+            methods[f'{name}.{method}'] = dict(
+                timing, construct_ms=construct_ms,
+                response_bytes=len(json.dumps(result, default=str)), resamples=resamples
+            )
+
+    return {
+        'rows': len(app_module.df),
+        'startup_ms': startup_ms,
+        'routes': routes,
+        'analyzers': methods,
+        'process_peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+
+
+def run(scales: List[int], repeat: int, resamples: Optional[int], seed: int) -> Dict:
+    """Benchmark each scale in a fresh process so startup and memory are isolated"""
+    from analysis.resampling import DEFAULT_RESAMPLES
+    from benchmarks.synthetic import generate_dataset
+    from utils.data_loader import load_data
+
+    worker_options = ['--repeat', str(repeat)]
+    if resamples is not None:
+        worker_options += ['--resamples', str(resamples)]
+
+    results = {
+        'metadata': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'resamples': DEFAULT_RESAMPLES if resamples is None else resamples,
+            'seed': seed,
+            'commit': _git_commit()
+        },
+        'scales': {}
+    }
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in scales:
+            data_path = DEFAULT_DATA_PATH
+            if scale != 1:
+                data_path = os.path.join(work_dir, f'combined_x{scale}.csv')
+                generate_dataset(load_data(), scale, seed).to_csv(data_path, index=False)
+
+            out_path = os.path.join(work_dir, f'result_x{scale}.json')
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.run', '--worker', out_path] + worker_options,
+                env=dict(os.environ, DATA_PATH=data_path), check=True
+            )
+            with open(out_path) as f:
+                results['scales'][str(scale)] = json.load(f)
+            print(f"Benchmarked {scale}x ({results['scales'][str(scale)]['rows']} rows)")
+    return results
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Routes and methods whose p50 latency grew by more than threshold times"""
+    regressions = []
+    for scale, result in current['scales'].items():
+        before = baseline['scales'].get(scale)
+        if before is None:
+            continue
+        for section in ('routes', 'analyzers'):
+            for name, timing in result[section].items():
+                if name not in before[section]:
+                    continue
+                old = before[section][name]['latency_ms']['p50']
+                new = timing['latency_ms']['p50']
+                if old > 0 and new / old > threshold:
+                    regressions.append(
+                        f"{scale}x {name}: p50 {old:.1f}ms -> {new:.1f}ms ({new / old:.2f}x)"
+                    )
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark every API route and analyzer method on synthetic data'
+    )
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES,
+                        help='Row count multipliers of the real dataset')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--resamples', type=int,
+                        help='Resamples per bootstrap/permutation instead of the production '
+                             'setting; timings are then not comparable to production')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='benchmark_results.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='Report regressions between two result files instead')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='p50 slowdown ratio reported as a regression')
+    parser.add_argument('--worker', metavar='OUT', help=argparse.SUPPRESS)
+    options = parser.parse_args(args)
+
+    if options.worker:
+        with open(options.worker, 'w') as f:
+            json.dump(benchmark_app(options.repeat, options.resamples), f)
+        return
+
+    if options.compare:
+        with open(options.compare[0]) as f:
+            baseline = json.load(f)
+        with open(options.compare[1]) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, options.threshold)
+        print('\n'.join(regressions) or 'No regressions')
+        sys.exit(1 if regressions else 0)
+
+    results = run(options.scales, options.repeat, options.resamples, options.seed)
+    with open(options.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {options.out}")
+
+
+if __name__ == '__main__':
+    main()
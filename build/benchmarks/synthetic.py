@@ -0,0 +1,67 @@
+import argparse
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+from utils.data_loader import DEFAULT_DATA_PATH, load_data
+
+# Spotify's track_genre taxonomy has 114 genres
+MAX_GENRES = 114
+# Jitter added to resampled rows, as a fraction of each column's std
+NOISE = 0.25
+
+
+def generate_dataset(df: pd.DataFrame, scale: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic combined_data-shaped frame with scale times as many rows.
+
+    The source rows are kept verbatim (so Singapore and every route's
+    lookups still resolve) and the rest are resampled from them with
+    per-column jitter, which keeps region proportions, column ranges,
+    missing values and cross-column correlations close to the real data.
+    Regions keep their real cardinality; genres grow with the dataset up to
+    MAX_GENRES, drawn with Zipf-like popularity.
+    """
+    rng = np.random.default_rng(seed)
+    n_extra = len(df) * (scale - 1)
+    extra = df.iloc[rng.integers(0, len(df), n_extra)].reset_index(drop=True)
+
+    numeric_cols = df.select_dtypes('number').columns
+    noise = rng.normal(0.0, NOISE, (n_extra, len(numeric_cols))) * df[numeric_cols].std().to_numpy()
+    extra[numeric_cols] = (extra[numeric_cols] + noise).clip(
+        df[numeric_cols].min(), df[numeric_cols].max(), axis=1
+    )
+
+    extra['Country'] = extra['Country'] + ' ' + pd.Series(np.arange(1, n_extra + 1)).astype(str)
+    extra['track_genre'] = _draw_genres(df['track_genre'], extra['track_genre'], scale, rng)
+
+    return pd.concat([df, extra], ignore_index=True)
+
+
+def _draw_genres(source: pd.Series, genres: pd.Series, scale: int,
+                 rng: np.random.Generator) -> pd.Series:
+    """Keep half of the resampled genres and redraw the rest from a larger pool"""
+    known = list(source.dropna().unique())
+    pool_size = min(MAX_GENRES, len(known) * scale)
+    pool = np.array(known + [f'genre-{i}' for i in range(pool_size - len(known))])
+
+    popularity = 1.0 / np.arange(1, len(pool) + 1)
+    redrawn = rng.choice(pool, len(genres), p=popularity / popularity.sum())
+    keep = rng.random(len(genres)) < 0.5
+    return genres.where(keep, pd.Series(redrawn, index=genres.index))
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Write a synthetic scaled-up combined_data.csv')
+    parser.add_argument('--scale', type=int, required=True, help='Row count multiplier')
+    parser.add_argument('--source', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args(args)
+
+    synthetic = generate_dataset(load_data(options.source), options.scale, options.seed)
+    synthetic.to_csv(options.out, index=False)
+    print(f"Wrote {len(synthetic)} rows to {options.out}")
+
+
+if __name__ == '__main__':
+    main()
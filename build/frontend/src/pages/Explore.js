@@ -864,41 +864,39 @@ function MusicHappinessSection({ data }) {
   const [activeRegion, setActiveRegion] = useState('all');
   const [selectedGenre, setSelectedGenre] = useState(null);
   const [carouselPage, setCarouselPage] = useState(0);
+  const [scatterPairs, setScatterPairs] = useState({});
   const ITEMS_PER_PAGE = 4;
 
+  // Fetch only the selected feature's scatter pair, once per feature
+  useEffect(() => {
+    if (scatterPairs[selectedFeature]) return;
+
+    axios.get('/api/viz/scatter', { params: { feature: selectedFeature, metric: 'Life Ladder' } })
+      .then(({ data: pair }) => {
+        const { columns, pair: refs } = pair;
+        const points = columns[refs.x].map((x, idx) => ({
+          x,
+          y: columns[refs.y][idx],
+          country: columns[refs.countries][idx],
+          region: columns[refs.regions][idx]
+        })).filter(d => d.x && d.y);
+
+        setScatterPairs(prev => ({
+          ...prev,
+          [selectedFeature]: { points, correlation: pair.correlation }
+        }));
+      })
+      .catch(err => console.error('Error fetching scatter data:', err));
+  }, [selectedFeature, scatterPairs]);
+
   const musicHappinessData = useMemo(() => {
     if (!data?.music?.country_features || !data?.rankings?.rankings) return {
-      correlations: {},
       features: [],
-      scatterData: {},
       allGenreStats: []
     };
 
     // Get all available features
     const features = ['energy', 'danceability', 'valence', 'acousticness', 'instrumentalness', 'liveness'];
-    
-    // Calculate correlations and prepare scatter data for all features
-    const correlations = {};
-    const scatterData = {};
-    
-    features.forEach(feature => {
-      const featureData = data.rankings.rankings.countries.map((country, idx) => {
-        const musicFeature = data.music.country_features[country]?.features[feature] || 0;
-        return {
-          x: musicFeature,
-          y: data.rankings.rankings.happiness_scores[idx] || 0,
-          country,
-          region: data.rankings.rankings.regions[idx]
-        };
-      }).filter(d => d.x !== 0 && d.y !== 0);
-
-      correlations[feature] = calculateCorrelation(
-        featureData.map(d => d.x),
-        featureData.map(d => d.y)
-      );
-      
-      scatterData[feature] = featureData;
-    });
 
     // Enhanced genre statistics calculation
     const genreStats = Object.entries(data.music.country_features)
@@ -935,9 +933,7 @@ function MusicHappinessSection({ data }) {
       }, {});
 
     return {
-      correlations,
       features,
-      scatterData,
       allGenreStats: Object.values(genreStats)
         .map(g => ({
           ...g,
@@ -1010,7 +1006,7 @@ function MusicHappinessSection({ data }) {
 
       <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', mb: 2 }}>
         <Typography variant="body2" color="text.secondary">
-          Correlation: {musicHappinessData.correlations[selectedFeature]?.toFixed(2) || 'N/A'}
+          Correlation: {scatterPairs[selectedFeature]?.correlation?.toFixed(2) || 'N/A'}
         </Typography>
         <Tooltip title={tooltipDescriptions.features[selectedFeature]} arrow>
           <InfoOutlinedIcon sx={{ color: 'text.secondary', fontSize: 16 }} />
@@ -1021,8 +1017,8 @@ function MusicHappinessSection({ data }) {
         {({ width, height }) => (
           <ScatterPlot
             data={activeRegion === 'all' 
-              ? musicHappinessData.scatterData[selectedFeature]
-              : musicHappinessData.scatterData[selectedFeature]?.filter(d => d.region === activeRegion)
+              ? scatterPairs[selectedFeature]?.points || []
+              : (scatterPairs[selectedFeature]?.points || []).filter(d => d.region === activeRegion)
             }
             width={width}
             height={height}
@@ -1205,20 +1201,6 @@ function MusicHappinessSection({ data }) {
   );
 }
 
-const calculateCorrelation = (array1, array2) => {
-  const n = array1.length;
-  const mean1 = mean(array1);
-  const mean2 = mean(array2);
-  
-  const numerator = sum(array1.map((x, i) => (x - mean1) * (array2[i] - mean2)));
-  const denominator = Math.sqrt(
-    sum(array1.map(x => Math.pow(x - mean1, 2))) *
-    sum(array2.map(x => Math.pow(x - mean2, 2)))
-  );
-  
-  return numerator / denominator;
-};
-
 const CorrelationMatrix = ({ data, dimensions, width, height, onCellClick }) => {
   const theme = useTheme();
   const margin = { top: 50, right: 50, bottom: 50, left: 50 };
@@ -1498,7 +1480,7 @@ function Explore() {
           axios.get('/api/viz/wellbeing-dimensions'),
           axios.get('/api/viz/mhq-distribution'),
           axios.get('/api/viz/music-features'),
-          axios.get('/api/viz/music-wellbeing-correlation'),
+          axios.get('/api/viz/music-wellbeing-correlation', { params: { layout: 'columnar' } }),
           axios.get('/api/viz/exploration-summary')
         ]);
 
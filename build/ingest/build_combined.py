@@ -0,0 +1,193 @@
+import argparse
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+from utils.data_loader import DEFAULT_DATA_PATH, cache_dir_for, write_columnar_cache
+
+AUDIO_FEATURES = [
+    'tempo', 'energy', 'valence', 'danceability',
+    'loudness', 'speechiness', 'acousticness',
+    'instrumentalness', 'liveness'
+]
+
+# Raw exports spell these differently from combined_data.csv
+COUNTRY_ALIASES = ['Country', 'country', 'Country name', 'country_name']
+DEFAULT_CHUNKSIZE = 500_000
+
+
+class FeatureAccumulator:
+    """Running per-country count, mean and M2 for each feature.
+
+    Chunks are folded in with Chan's parallel update, so accumulators built on
+    separate files or workers can be merged and memory stays proportional to
+    countries x features regardless of input size.
+    """
+
+    def __init__(self, features: List[str]):
+        self.features = features
+        self.count = pd.DataFrame(columns=features, dtype=float)
+        self.mean = pd.DataFrame(columns=features, dtype=float)
+        self.m2 = pd.DataFrame(columns=features, dtype=float)
+
+    def update(self, chunk: pd.DataFrame, group_col: str) -> None:
+        """Fold a chunk of rows into the running statistics"""
+        groups = chunk.groupby(group_col)[self.features]
+        count = groups.count().astype(float)
+        mean = groups.mean()
+        m2 = (groups.var(ddof=1) * (count - 1)).fillna(0.0)
+        self._combine(count, mean, m2)
+
+    def merge(self, other: 'FeatureAccumulator') -> None:
+        """Fold another accumulator's statistics into this one"""
+        self._combine(other.count, other.mean, other.m2)
+
+    def std(self) -> pd.DataFrame:
+        """Sample standard deviation per country"""
+        return np.sqrt(self.m2 / (self.count - 1))
+
+    def _combine(self, count: pd.DataFrame, mean: pd.DataFrame, m2: pd.DataFrame) -> None:
+        index = self.count.index.union(count.index)
+        n_a = self.count.reindex(index).fillna(0.0)
+        n_b = count.reindex(index).fillna(0.0)
+        mean_a = self.mean.reindex(index).fillna(0.0)
+        mean_b = mean.reindex(index).fillna(0.0)
+
+        total = n_a + n_b
+        delta = mean_b - mean_a
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.mean = (mean_a + delta * n_b / total).where(total > 0)
+            self.m2 = (
+                self.m2.reindex(index).fillna(0.0)
+                + m2.reindex(index).fillna(0.0)
+                + delta ** 2 * n_a * n_b / total
+            ).where(total > 0, 0.0)
+        self.count = total
+
+
+class ModeAccumulator:
+    """Running per-country value counts for picking the most common value"""
+
+    def __init__(self):
+        self.counts = pd.Series(
+            dtype=float, index=pd.MultiIndex.from_arrays([[], []], names=['group', 'value'])
+        )
+
+    def update(self, chunk: pd.DataFrame, group_col: str, value_col: str) -> None:
+        """Fold a chunk's value counts into the running totals"""
+        counts = chunk.groupby([group_col, value_col]).size().rename_axis(['group', 'value'])
+        self.counts = self.counts.add(counts, fill_value=0)
+
+    def merge(self, other: 'ModeAccumulator') -> None:
+        """Fold another accumulator's counts into this one"""
+        self.counts = self.counts.add(other.counts, fill_value=0)
+
+    def mode(self) -> pd.Series:
+        """Most common value per country, ties broken alphabetically"""
+        counts = self.counts.rename('count').reset_index()
+        counts = counts.sort_values(['group', 'count', 'value'], ascending=[True, False, True])
+        return counts.drop_duplicates('group').set_index('group')['value']
+
+
+def _country_column(columns) -> str:
+    for alias in COUNTRY_ALIASES:
+        if alias in columns:
+            return alias
+    raise ValueError(f"No country column found; expected one of {COUNTRY_ALIASES}")
+
+
+def accumulate_tracks(paths: List[str], features: List[str] = AUDIO_FEATURES,
+                      genre_col: str = 'track_genre',
+                      chunksize: int = DEFAULT_CHUNKSIZE) -> Dict:
+    """Stream raw track-level exports and accumulate per-country statistics"""
+    feature_stats = FeatureAccumulator(features)
+    genre_counts = ModeAccumulator()
+
+    for path in paths:
+        country_col = _country_column(pd.read_csv(path, nrows=0).columns)
+        reader = pd.read_csv(
+            path, chunksize=chunksize,
+            usecols=[country_col, genre_col] + features
+        )
+        for chunk in reader:
+            feature_stats.update(chunk, country_col)
+            genre_counts.update(chunk, country_col, genre_col)
+
+    return {'features': feature_stats, 'genres': genre_counts}
+
+
+def load_wellbeing_tables(mental_state_path: str, happiness_path: str) -> pd.DataFrame:
+    """Join the per-country Mental State and World Happiness Report tables.
+
+    The happiness report is yearly, so the latest year per country is used.
+    """
+    mental_state = pd.read_csv(mental_state_path)
+    mental_state = mental_state.rename(columns={_country_column(mental_state.columns): 'Country'})
+
+    happiness = pd.read_csv(happiness_path)
+    happiness = happiness.rename(columns={_country_column(happiness.columns): 'Country'})
+    if 'year' in happiness.columns:
+        happiness = (happiness.sort_values('year')
+                     .drop_duplicates('Country', keep='last')
+                     .drop(columns='year'))
+
+    return mental_state.merge(happiness, on='Country', how='inner')
+
+
+def build_combined(track_paths: List[str], mental_state_path: str, happiness_path: str,
+                   regions_path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                   include_std: bool = False) -> pd.DataFrame:
+    """Build the combined per-country dataset from raw inputs"""
+    stats = accumulate_tracks(track_paths, chunksize=chunksize)
+
+    music = stats['features'].mean
+    if include_std:
+        music = music.join(stats['features'].std().add_suffix('_std'))
+    music = music.rename_axis('Country').reset_index()
+
+    regions = pd.read_csv(regions_path)
+    regions = regions.rename(columns={_country_column(regions.columns): 'Country'})
+    genres = stats['genres'].mode().rename('track_genre').rename_axis('Country').reset_index()
+
+    combined = load_wellbeing_tables(mental_state_path, happiness_path)
+    combined = (combined.merge(music, on='Country', how='inner')
+                .merge(regions[['Country', 'region']], on='Country', how='inner')
+                .merge(genres, on='Country', how='inner'))
+    return combined.sort_values('Country').reset_index(drop=True)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Build combined_data.csv and its columnar cache from raw exports'
+    )
+    parser.add_argument('--tracks', nargs='+', help='Raw track-level Spotify export CSVs')
+    parser.add_argument('--mental-state', help='Per-country Mental State report CSV')
+    parser.add_argument('--happiness', help='World Happiness Report CSV')
+    parser.add_argument('--regions', help='CSV mapping Country to region')
+    parser.add_argument('--out', default=DEFAULT_DATA_PATH, help='Output CSV path')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--with-std', action='store_true',
+                        help='Also emit <feature>_std columns')
+    parser.add_argument('--cache-only', action='store_true',
+                        help='Only (re)build the columnar cache for an existing CSV')
+    options = parser.parse_args(args)
+
+    if options.cache_only:
+        combined = pd.read_csv(options.out)
+    else:
+        required = ['tracks', 'mental_state', 'happiness', 'regions']
+        missing = [name for name in required if not getattr(options, name)]
+        if missing:
+            parser.error(f"missing required inputs: {', '.join(missing)}")
+        combined = build_combined(
+            options.tracks, options.mental_state, options.happiness, options.regions,
+            chunksize=options.chunksize, include_std=options.with_std
+        )
+        combined.to_csv(options.out, index=False)
+
+    write_columnar_cache(combined, cache_dir_for(options.out), source_path=options.out)
+    print(f"Wrote {len(combined)} countries to {options.out}")
+
+
+if __name__ == '__main__':
+    main()
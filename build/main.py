@@ -1,25 +1,24 @@
+import functools
+import os
+from typing import Tuple
+from urllib.parse import urlencode
 import dash
 from dash import html, dcc, callback, Input, Output
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 import numpy as np
-from flask import jsonify
+from flask import jsonify, request, Response
 from flask_cors import CORS
-from scipy import stats
-
-# Import analysis modules
-from analysis.foundation.music_patterns import MusicPatternAnalyzer
-from analysis.foundation.wellbeing_landscape import WellbeingAnalyzer
-from analysis.foundation.global_metrics import GlobalMetricsAnalyzer
-from analysis.relationships.music_happiness import MusicHappinessAnalyzer
-from analysis.relationships.music_mhq import MusicMHQAnalyzer
-from analysis.regional.asia_analysis import AsiaAnalyzer
-from analysis.regional.cross_regional import CrossRegionalAnalyzer
-from analysis.singapore_focus.recommendations import RecommendationEngine
-from analysis.singapore_focus.comparative import SingaporeComparative
-from analysis.singapore_focus.cultural_context import CulturalContextAnalyzer
+
+# Analyzers are imported lazily by the registry
+from analysis.registry import AnalyzerRegistry, ANALYZERS
+from analysis.comparative_engine import get_comparative_engine
+from analysis.correlation_engine import get_correlation_engine, nested_dict
+from analysis.similarity_index import get_similarity_index
+from analysis.resampling import get_resampling_engine
+from utils.snapshot import DataSnapshot
+from utils.data_loader import DEFAULT_DATA_PATH, load_data
+from utils.metrics import RequestMetrics
+from utils import payload
 
 # Initialize the Dash app
 app = dash.Dash(
@@ -40,20 +39,20 @@ app.layout = html.Div([
 # Enable CORS
 CORS(app.server)
 
-# Load the data
-df = pd.read_csv('data/combined_data.csv')
-
-# Initialize analyzers
-music_pattern_analyzer = MusicPatternAnalyzer(df)
-wellbeing_analyzer = WellbeingAnalyzer(df)
-global_metrics_analyzer = GlobalMetricsAnalyzer(df)
-music_happiness_analyzer = MusicHappinessAnalyzer(df)
-music_mhq_analyzer = MusicMHQAnalyzer(df)
-asia_analyzer = AsiaAnalyzer(df)
-cross_regional_analyzer = CrossRegionalAnalyzer(df)
-recommendation_engine = RecommendationEngine(df)
-singapore_comparative = SingaporeComparative(df)
-cultural_context_analyzer = CulturalContextAnalyzer(df)
+# Opt-in request timing, reported at /api/metrics
+metrics = RequestMetrics() if os.environ.get('REQUEST_METRICS') == '1' else None
+if metrics is not None:
+    metrics.init_app(app.server)
+
+# Load the data (DATA_PATH lets benchmarks point the app at synthetic data)
+df = load_data(os.environ.get('DATA_PATH', DEFAULT_DATA_PATH))
+snapshot = DataSnapshot(df)
+correlations = get_correlation_engine(df)
+resampling = get_resampling_engine(df)
+comparative = get_comparative_engine(df)
+
+# Analyzers are constructed on first use; their results are cached on disk
+analyzers = AnalyzerRegistry(df, snapshot.version)
 
 # Feature categories (existing code...)
 MUSIC_FEATURES = [
@@ -77,23 +76,76 @@ DEMOGRAPHIC_METRICS = [
 ]
 
 
+def cached_json(*params: str, uncached: Tuple[str, ...] = ()):
+    """Serve a route from the snapshot's response cache with ETag support.
+
+    Views returning a dict are encoded per the Accept header (JSON, MessagePack
+    or Arrow IPC), and bodies are compressed per Accept-Encoding. Responses are
+    cached under the route path and the query args in params, the ones the
+    view reads, so other args cannot grow the cache. Requests with any of the
+    uncached args (e.g. ad-hoc query vectors) are not cached.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            mimetype = request.accept_mimetypes.best_match(
+                payload.available_mimetypes(), default=payload.JSON
+            )
+            encoding = request.accept_encodings.best_match(payload.available_encodings())
+            key = None
+            if not any(name in request.args for name in uncached):
+                query = urlencode([(name, value) for name in params
+                                   for value in request.args.getlist(name)])
+                key = f'{request.path}?{query}|{mimetype}|{encoding}'
+
+            cached = snapshot.get_response(key) if key else None
+            if cached is None:
+                result = view(*args, **kwargs)
+                if isinstance(result, dict) and mimetype != payload.JSON:
+                    body = payload.encode(result, mimetype)
+                else:
+                    response = app.server.make_response(result)
+                    if response.status_code != 200:
+                        return response
+                    body, mimetype = response.get_data(), response.mimetype
+
+                headers = {'Content-Type': mimetype}
+                if encoding and len(body) >= payload.MIN_COMPRESS_SIZE:
+                    body = payload.compress(body, encoding)
+                    headers['Content-Encoding'] = encoding
+                cached = snapshot.store_response(key, body, headers)
+
+            body, etag, headers = cached
+            response = Response(body, headers=headers)
+            response.vary.update(['Accept', 'Accept-Encoding'])
+            response.set_etag(etag)
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def columnar_requested() -> bool:
+    """Whether the client asked for the columnar layout (?layout=columnar)"""
+    return request.args.get('layout') == 'columnar'
+
+
 @app.server.route('/api/countries')
+@cached_json()
 def get_all_countries():
     """
     Returns data for all countries in a single JSON response.
     """
     countries_data = {}
-    
-    for country in df['Country'].unique():
+
+    for country in snapshot.country_index:
         # Get country data
-        country_data = df[df['Country'] == country].iloc[0]
-        region_data = df[df['region'] == country_data['region']]
-        
-        # Calculate rankings
-        mhq_global_rank = int(df['Average MHQ Score'].rank(ascending=False)[country_data.name])
-        happiness_global_rank = int(df['Life Ladder'].rank(ascending=False)[country_data.name])
-        mhq_regional_rank = int(region_data['Average MHQ Score'].rank(ascending=False)[country_data.name])
-        happiness_regional_rank = int(region_data['Life Ladder'].rank(ascending=False)[country_data.name])
+        country_data = snapshot.country_row(country)
+
+        # Look up precomputed rankings
+        mhq_global_rank = snapshot.global_rank('Average MHQ Score', country)
+        happiness_global_rank = snapshot.global_rank('Life Ladder', country)
+        mhq_regional_rank = snapshot.regional_rank('Average MHQ Score', country)
+        happiness_regional_rank = snapshot.regional_rank('Life Ladder', country)
 
         countries_data[country] = {
             'region': country_data['region'],
@@ -150,7 +202,7 @@ def get_all_countries():
     
     # Add summary statistics
     summary = {
-        'total_countries': len(df['Country'].unique()),
+        'total_countries': len(snapshot.country_index),
         'regions': sorted(df['region'].unique().tolist()),
         'genres': sorted(df['track_genre'].unique().tolist()),
         'global_averages': {
@@ -167,6 +219,7 @@ def get_all_countries():
 
 
 @app.server.route('/api/viz/global-rankings')
+@cached_json()
 def get_rankings_viz_data():
     """
     Returns data formatted for global rankings visualizations.
@@ -217,41 +270,49 @@ def get_rankings_viz_data():
         return jsonify({'error': str(e)}), 500
 
 @app.server.route('/api/viz/wellbeing-dimensions')
+@cached_json('layout')
 def get_wellbeing_dimensions_data():
     """
     Returns data for wellbeing dimensions comparison.
     Supports radar charts and parallel coordinates plots.
+    With ?layout=columnar, per-country data is sent as one list per column.
     """
     try:
         # Get wellbeing dimension columns
         dimension_cols = [col for col in df.columns if 'Average' in col and 'Score' in col]
-        
-        # Prepare data by country
-        country_data = {}
-        for country in df['Country'].unique():
-            country_df = df[df['Country'] == country]
-            country_data[country] = {
-                'dimensions': {col: float(country_df[col].iloc[0].round(2)) 
-                             for col in dimension_cols},
-                'region': country_df['region'].iloc[0]
-            }
 
         # Calculate regional averages
         regional_averages = df.groupby('region')[dimension_cols].mean().round(2).to_dict('index')
 
         response = {
-            'country_data': country_data,
             'regional_averages': regional_averages,
             'dimension_names': [col.replace('Average ', '').replace(' Score', '') 
                               for col in dimension_cols],
             'regions': sorted(df['region'].unique().tolist())
         }
 
-        return jsonify(response)
+        # Prepare data by country
+        if columnar_requested():
+            response['columns'] = payload.columns_table(
+                snapshot.countries, ['Country', 'region'] + dimension_cols, decimals=2
+            )
+        else:
+            dimensions = snapshot.countries[dimension_cols].round(2)
+            country_data = {}
+            for country, idx in snapshot.country_index.items():
+                country_data[country] = {
+                    'dimensions': {col: float(dimensions.at[idx, col])
+                                 for col in dimension_cols},
+                    'region': df.at[idx, 'region']
+                }
+            response['country_data'] = country_data
+
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.server.route('/api/viz/mhq-distribution')
+@cached_json()
 def get_mhq_distribution_data():
     """
     Returns data for MHQ score distribution visualizations.
@@ -290,39 +351,29 @@ def get_mhq_distribution_data():
         return jsonify({'error': str(e)}), 500
 
 @app.server.route('/api/viz/music-features')
+@cached_json('layout')
 def get_music_features_data():
     """
     Returns data for music features visualizations.
     Supports radar charts and feature comparisons.
+    With ?layout=columnar, per-country data is sent as one list per column.
     """
     try:
         # Define music features
         features = ['tempo', 'energy', 'valence', 'danceability', 'loudness',
                    'speechiness', 'acousticness', 'instrumentalness', 'liveness']
 
-        # Get data by country
-        country_features = {}
-        for country in df['Country'].unique():
-            country_df = df[df['Country'] == country]
-            country_features[country] = {
-                'features': {feature: float(country_df[feature].iloc[0]) 
-                           for feature in features},
-                'genre': country_df['track_genre'].iloc[0],
-                'region': country_df['region'].iloc[0]
-            }
-
         # Calculate regional averages
+        region_features = snapshot.region_means[features].round(3)
         regional_features = {}
-        for region in df['region'].unique():
-            region_df = df[df['region'] == region]
+        for region in region_features.index:
             regional_features[region] = {
-                'features': {feature: float(region_df[feature].mean().round(3)) 
+                'features': {feature: float(region_features.at[region, feature])
                            for feature in features},
-                'dominant_genre': region_df['track_genre'].mode().iloc[0]
+                'dominant_genre': snapshot.region_genre_modes[region]
             }
 
         response = {
-            'country_features': country_features,
             'regional_features': regional_features,
             'feature_ranges': {
                 feature: {
@@ -334,11 +385,28 @@ def get_music_features_data():
             }
         }
 
-        return jsonify(response)
+        # Get data by country
+        if columnar_requested():
+            response['columns'] = payload.columns_table(
+                snapshot.countries, ['Country', 'region', 'track_genre'] + features
+            )
+        else:
+            country_features = {}
+            for country, idx in snapshot.country_index.items():
+                country_features[country] = {
+                    'features': {feature: float(df.at[idx, feature])
+                               for feature in features},
+                    'genre': df.at[idx, 'track_genre'],
+                    'region': df.at[idx, 'region']
+                }
+            response['country_features'] = country_features
+
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.server.route('/api/viz/genre-analysis')
+@cached_json()
 def get_genre_analysis_data():
     """
     Returns data for genre analysis visualizations.
@@ -353,14 +421,7 @@ def get_genre_analysis_data():
 
         # Genre correlations with wellbeing metrics
         wellbeing_cols = [col for col in df.columns if 'Average' in col and 'Score' in col]
-        genre_dummies = pd.get_dummies(df['track_genre'])
-        correlations = {}
-        
-        for metric in wellbeing_cols:
-            correlations[metric] = {
-                genre: float(df[metric].corr(genre_dummies[genre]).round(3))
-                for genre in genre_dummies.columns
-            }
+        genre_correlations = correlations.correlate_categories('track_genre', wellbeing_cols)
 
         response = {
             'distribution': {
@@ -369,7 +430,7 @@ def get_genre_analysis_data():
             },
             'wellbeing_relationship': {
                 'average_mhq': genre_mhq.to_dict('index'),
-                'correlations': correlations
+                'correlations': nested_dict(genre_correlations['r'].round(3), transpose=True)
             },
             'genres': sorted(df['track_genre'].unique().tolist()),
             'regions': sorted(df['region'].unique().tolist())
@@ -380,10 +441,14 @@ def get_genre_analysis_data():
         return jsonify({'error': str(e)}), 500
 
 @app.server.route('/api/viz/music-wellbeing-correlation')
+@cached_json('layout', 'intervals')
 def get_music_wellbeing_correlation_data():
     """
     Returns correlation data between music features and wellbeing metrics.
     Supports heatmaps and scatter plots.
+    With ?layout=columnar, each column is sent once and scatter pairs
+    reference columns by name instead of repeating them.
+    With ?intervals=true, bootstrap CIs and permutation p-values are added.
     """
     try:
         # Define features and metrics
@@ -392,86 +457,220 @@ def get_music_wellbeing_correlation_data():
         wellbeing_metrics = [col for col in df.columns if 'Average' in col and 'Score' in col]
 
         # Calculate correlations
-        correlations = {}
-        for feature in music_features:
-            correlations[feature] = {
-                metric: float(df[feature].corr(df[metric]).round(3))
-                for metric in wellbeing_metrics
+        feature_correlations = correlations.correlate(music_features, wellbeing_metrics)
+
+        response = {
+            'correlations': nested_dict(feature_correlations['r'].round(3)),
+            'features': music_features,
+            'metrics': [metric.replace('Average ', '').replace(' Score', '') 
+                       for metric in wellbeing_metrics]
+        }
+
+        if request.args.get('intervals') == 'true':
+            intervals = resampling.correlate(music_features, wellbeing_metrics)
+            response['correlation_intervals'] = {
+                feature: {
+                    metric: {
+                        'ci_low': round(float(intervals['ci_low'].at[feature, metric]), 3),
+                        'ci_high': round(float(intervals['ci_high'].at[feature, metric]), 3),
+                        'p_perm': float(intervals['p_perm'].at[feature, metric])
+                    }
+                    for metric in wellbeing_metrics
+                }
+                for feature in music_features
             }
 
         # Get scatter plot data for each feature-metric pair
-        scatter_data = {}
-        for feature in music_features:
-            scatter_data[feature] = {
-                metric: {
-                    'x': df[feature].tolist(),
-                    'y': df[metric].tolist(),
-                    'countries': df['Country'].tolist(),
-                    'regions': df['region'].tolist()
+        if columnar_requested():
+            response['columns'] = payload.columns_table(
+                df, ['Country', 'region'] + music_features + wellbeing_metrics
+            )
+            response['scatter_pairs'] = {
+                feature: {
+                    metric: {'x': feature, 'y': metric, 'countries': 'Country', 'regions': 'region'}
+                    for metric in wellbeing_metrics
                 }
-                for metric in wellbeing_metrics
+                for feature in music_features
             }
+        else:
+            scatter_data = {}
+            for feature in music_features:
+                scatter_data[feature] = {
+                    metric: {
+                        'x': df[feature].tolist(),
+                        'y': df[metric].tolist(),
+                        'countries': df['Country'].tolist(),
+                        'regions': df['region'].tolist()
+                    }
+                    for metric in wellbeing_metrics
+                }
+            response['scatter_data'] = scatter_data
+
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+
+@app.server.route('/api/viz/scatter')
+@cached_json('feature', 'metric', 'intervals')
+def get_scatter_pair_data():
+    """
+    Returns scatter plot data for a single feature/metric pair
+    (?feature=&metric=), so clients can fetch pairs on demand.
+    With ?intervals=true, the bootstrap CI and permutation p-value are added.
+    """
+    feature = request.args.get('feature')
+    metric = request.args.get('metric')
+    numeric_cols = df.select_dtypes('number').columns
+    unknown = [name for name in (feature, metric) if name not in numeric_cols]
+    if unknown:
+        return jsonify({'error': f"Unknown numeric column(s): {unknown}"}), 400
+
+    try:
+        pair = correlations.correlate([feature], [metric])
 
         response = {
-            'correlations': correlations,
-            'scatter_data': scatter_data,
-            'features': music_features,
-            'metrics': [metric.replace('Average ', '').replace(' Score', '') 
-                       for metric in wellbeing_metrics]
+            'columns': payload.columns_table(
+                df, list(dict.fromkeys(['Country', 'region', feature, metric]))
+            ),
+            'pair': {'x': feature, 'y': metric, 'countries': 'Country', 'regions': 'region'},
+            'correlation': float(pair['r'].iloc[0, 0].round(3)),
+            'p_value': float(pair['p'].iloc[0, 0]),
+            'sample_size': int(pair['n'].iloc[0, 0])
         }
 
-        return jsonify(response)
+        # Resampling is opt-in: it is too slow to run on every uncached pair
+        if request.args.get('intervals') == 'true':
+            intervals = resampling.correlate([feature], [metric])
+            response.update({
+                'ci_low': float(intervals['ci_low'].iloc[0, 0].round(3)),
+                'ci_high': float(intervals['ci_high'].iloc[0, 0].round(3)),
+                'p_perm': float(intervals['p_perm'].iloc[0, 0])
+            })
+
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    
+
+
+def _parse_pairs(value: str) -> dict:
+    """Parse 'name:number,name:number' query values"""
+    pairs = {}
+    for item in filter(None, value.split(',')):
+        name, _, number = item.partition(':')
+        pairs[name.strip()] = float(number)
+    return pairs
+
+
+@app.server.route('/api/similar')
+@cached_json('country', 'k', 'profile', 'metric', 'weights', uncached=('vector',))
+def get_similar_countries():
+    """
+    Returns the k nearest countries by music, wellbeing or combined profile.
+    Query with one or more ?country= values and/or ad-hoc ?vector=name:value,...
+    profiles in raw column units. Supports ?k=, ?profile=music|wellbeing|combined,
+    ?metric=euclidean|cosine|mahalanobis|weighted and ?weights=name:value,...
+    """
+    queries = request.args.getlist('country')
+    try:
+        k = int(request.args.get('k', 5))
+        vectors = [_parse_pairs(value) for value in request.args.getlist('vector')]
+        weights = _parse_pairs(request.args.get('weights', ''))
+        index = get_similarity_index(
+            df, request.args.get('profile', 'music'),
+            request.args.get('metric', 'euclidean'), weights or None
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not queries and not vectors:
+        return jsonify({'error': 'Provide at least one country or vector'}), 400
+    unknown = [country for country in queries if country not in index.positions]
+    unknown += [name for vector in vectors for name in vector if name not in index.columns]
+    if unknown:
+        return jsonify({'error': f"Unknown country or column(s): {unknown}"}), 400
+
+    try:
+        results = []
+        if queries:
+            neighbors = index.kneighbors(queries, k)
+            results += [{'query': country, 'neighbors': neighbors[country]} for country in queries]
+        if vectors:
+            neighbors = index.query(vectors, k)
+            results += [{'query': vector, 'neighbors': hits} for vector, hits in zip(vectors, neighbors)]
+
+        for result in results:
+            result['neighbors'] = [
+                {'country': country, 'distance': round(distance, 4)}
+                for country, distance in result['neighbors'].items()
+            ]
+
+        return {
+            'profile': request.args.get('profile', 'music'),
+            'metric': index.metric,
+            'features': index.columns,
+            'results': results
+        }
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.server.route('/api/country/<name>/comparative')
+@cached_json('groups')
+def get_country_comparative(name):
+    """
+    Returns a country's percentile ranks and z-scores globally and within its
+    region, with both distributions' statistics, for each column group.
+    Restrict the groups with ?groups=music,mhq_scores,...
+    """
+    groups = [group for group in request.args.get('groups', '').split(',') if group]
+    try:
+        if name not in comparative:
+            return jsonify({'error': f"Unknown country: {name}"}), 404
+        return comparative.profile(name, groups or None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
 @app.server.route('/api/viz/mental-health')
+@cached_json('layout')
 def get_mental_health_data():
     """
     Returns mental health distribution data.
     Supports stacked bar charts and distribution analysis.
+    With ?layout=columnar, per-country data is sent as one list per column.
     """
     try:
         # Mental health categories
         mh_categories = ['% Distressed', '% Struggling', '% Enduring',
                         '% Managing', '% Succeeding', '% Thriving']
 
-        # Get distribution by country
-        country_distribution = {}
-        for country in df['Country'].unique():
-            country_df = df[df['Country'] == country]
-            country_distribution[country] = {
-                'distribution': {cat: float(country_df[cat].iloc[0].round(2)) 
-                               for cat in mh_categories},
-                'region': country_df['region'].iloc[0],
-                'mhq_score': float(country_df['Average MHQ Score'].iloc[0].round(2))
-            }
-
         # Calculate regional distributions
+        region_values = snapshot.region_means[mh_categories + ['Average MHQ Score']].round(2)
         regional_distribution = {}
-        for region in df['region'].unique():
-            region_df = df[df['region'] == region]
+        for region in region_values.index:
             regional_distribution[region] = {
-                'distribution': {cat: float(region_df[cat].mean().round(2)) 
+                'distribution': {cat: float(region_values.at[region, cat])
                                for cat in mh_categories},
-                'mhq_score': float(region_df['Average MHQ Score'].mean().round(2)),
-                'country_count': len(region_df)
+                'mhq_score': float(region_values.at[region, 'Average MHQ Score']),
+                'country_count': int(snapshot.region_sizes[region])
             }
 
         # Global statistics
         global_stats = {
             'distribution': {cat: float(df[cat].mean().round(2)) 
                            for cat in mh_categories},
-            'correlations': {
-                cat: {
-                    'mhq': float(df[cat].corr(df['Average MHQ Score']).round(3)),
-                    'happiness': float(df[cat].corr(df['Life Ladder']).round(3))
-                } for cat in mh_categories
-            }
+            'correlations': nested_dict(
+                correlations.correlate(mh_categories, ['Average MHQ Score', 'Life Ladder'])['r']
+                .round(3)
+                .rename(columns={'Average MHQ Score': 'mhq', 'Life Ladder': 'happiness'})
+            )
         }
 
         response = {
-            'country_distribution': country_distribution,
             'regional_distribution': regional_distribution,
             'global_stats': global_stats,
             'categories': [cat.replace('% ', '') for cat in mh_categories],
@@ -485,13 +684,32 @@ def get_mental_health_data():
             }
         }
 
-        return jsonify(response)
+        # Get distribution by country
+        if columnar_requested():
+            response['columns'] = payload.columns_table(
+                snapshot.countries, ['Country', 'region', 'Average MHQ Score'] + mh_categories,
+                decimals=2
+            )
+        else:
+            country_values = snapshot.countries[mh_categories + ['Average MHQ Score']].round(2)
+            country_distribution = {}
+            for country, idx in snapshot.country_index.items():
+                country_distribution[country] = {
+                    'distribution': {cat: float(country_values.at[idx, cat])
+                                   for cat in mh_categories},
+                    'region': df.at[idx, 'region'],
+                    'mhq_score': float(country_values.at[idx, 'Average MHQ Score'])
+                }
+            response['country_distribution'] = country_distribution
+
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 # Add summary endpoint for the exploration page
 @app.server.route('/api/viz/exploration-summary')
+@cached_json()
 def get_exploration_summary():
     """
     Returns summary statistics and highlights for the exploration page.
@@ -538,7 +756,50 @@ def get_exploration_summary():
         return jsonify(summary)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    
+
+
+@app.server.route('/api/metrics')
+def get_request_metrics():
+    """
+    Returns per-route request counts, latency histograms and payload sizes.
+    Only available when the app is started with REQUEST_METRICS=1.
+    """
+    if metrics is None:
+        return jsonify({'error': 'Request metrics are disabled; set REQUEST_METRICS=1'}), 404
+    return jsonify(metrics.report())
+
+
+@app.server.route('/api/analysis')
+@cached_json()
+def get_analysis_index():
+    """
+    Lists the analyzer results served under /api/analysis/<analyzer>/<method>.
+    """
+    return {
+        name: {'version': spec['version'], 'methods': spec['methods']}
+        for name, spec in ANALYZERS.items()
+    }
+
+
+@app.server.route('/api/analysis/<analyzer>/<method>')
+@cached_json()
+def get_analysis_result(analyzer, method):
+    """
+    Returns an analyzer result, e.g. /api/analysis/recommendations/generate_recommendations.
+    Results are persisted per dataset and analyzer version, so they are only
+    computed once across restarts and workers.
+    """
+    if method not in ANALYZERS.get(analyzer, {}).get('methods', []):
+        return jsonify({'error': f"Unknown analysis: {analyzer}/{method}"}), 404
+
+    try:
+        result = analyzers.result(analyzer, method)
+        if isinstance(result, dict) and 'error' in result:
+            return jsonify(result), 500
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
 if __name__ == '__main__':
     app.run_server(debug=True, port=8050)
\ No newline at end of file
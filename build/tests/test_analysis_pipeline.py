@@ -0,0 +1,74 @@
+import json
+from utils.test_utils import run_test
+from analysis.pipeline import Node, analyzer_pipeline
+from analysis.registry import AnalyzerRegistry
+from validation.flow_visualizer import AnalysisFlowVisualizer
+
+ANALYZERS = ['music_patterns', 'wellbeing', 'global_metrics', 'singapore_comparative']
+
+def _mhq_summary(frame, upstream):
+    """Downstream node combining two upstream results"""
+    position = upstream['wellbeing.analyze_singapore_wellbeing']['mhq_dimensions']
+    profile = upstream['wellbeing.get_mhq_profile']['dimensions']
+    return {dim: position[dim]['value'] - profile[dim]['global_stats']['mean'] for dim in position}
+
+def _pipeline():
+    pipeline = analyzer_pipeline(ANALYZERS, workers=4)
+    pipeline.add(Node('mhq_summary', _mhq_summary, upstream=[
+        'wellbeing.analyze_singapore_wellbeing', 'wellbeing.get_mhq_profile'
+    ]))
+    return pipeline
+
+@run_test
+def test_matches_analyzers(df):
+    pipeline = _pipeline()
+    results = pipeline.run(df)
+
+    registry = AnalyzerRegistry(df, 'test', cache_dir=None)
+    for name, result in results.items():
+        if name != 'mhq_summary':
+            # Compared as JSON so NaN statistics compare equal
+            assert json.dumps(result) == json.dumps(registry.result(*name.split('.'))), name
+
+    visualizer = AnalysisFlowVisualizer(pipeline)
+    visualizer.generate_flow_diagram()
+    source = visualizer.dot.source
+    assert '"wellbeing.get_mhq_profile" -> mhq_summary' in source
+    assert 'music_data -> "music_patterns.get_feature_distributions"' in source
+    assert f"{pipeline.timings['mhq_summary']['seconds']:.2f}s" in source
+
+    return pipeline.timings
+
+@run_test
+def test_incremental_recompute(df):
+    pipeline = _pipeline()
+    pipeline.run(df)
+    assert not any(timing['cached'] for timing in pipeline.timings.values())
+
+    # Only nodes reading Singapore's updated wellbeing score, and their downstream, rerun
+    updated = df.copy()
+    updated.loc[updated['Country'] == 'Singapore', 'Average Cognition Score'] += 5
+    results = pipeline.run(updated)
+    rerun = {name for name, timing in pipeline.timings.items() if not timing['cached']}
+    assert 'wellbeing.analyze_singapore_wellbeing' in rerun and 'mhq_summary' in rerun
+    assert 'music_patterns.get_feature_distributions' not in rerun
+    assert 'singapore_comparative.analyze_demographic_position' not in rerun
+
+    expected = AnalyzerRegistry(updated, 'test', cache_dir=None)
+    assert results['wellbeing.analyze_singapore_wellbeing'] == expected.result(
+        'wellbeing', 'analyze_singapore_wellbeing'
+    )
+
+    pipeline.run(updated)
+    assert all(timing['cached'] for timing in pipeline.timings.values())
+
+    print(f"\nRecomputed {len(rerun)} of {len(pipeline.nodes)} nodes after the update:")
+    for name in sorted(rerun):
+        print(f"  {name}")
+
+    return rerun
+
+if __name__ == "__main__":
+    print("Running analysis pipeline tests...")
+    timings = test_matches_analyzers()
+    rerun = test_incremental_recompute()
@@ -0,0 +1,51 @@
+from utils.test_utils import run_test
+from utils.metrics import RequestMetrics
+from benchmarks.synthetic import generate_dataset, MAX_GENRES
+from flask import Flask, jsonify
+import pandas as pd
+
+@run_test
+def test_synthetic_dataset(df):
+    synthetic = generate_dataset(df, 20)
+
+    assert len(synthetic) == 20 * len(df)
+    assert list(synthetic.columns) == list(df.columns)
+    pd.testing.assert_frame_equal(synthetic.iloc[:len(df)], df)
+    assert synthetic['Country'].is_unique
+    assert set(synthetic['region']) == set(df['region'])
+    assert df['track_genre'].nunique() < synthetic['track_genre'].nunique() <= MAX_GENRES
+
+    numeric = df.select_dtypes('number').columns
+    assert (synthetic[numeric].min() >= df[numeric].min()).all()
+    assert (synthetic[numeric].max() <= df[numeric].max()).all()
+
+    return synthetic
+
+@run_test
+def test_request_metrics(df):
+    server = Flask(__name__)
+    metrics = RequestMetrics()
+    metrics.init_app(server)
+
+    @server.route('/api/item/<name>')
+    def item(name):
+        return jsonify({'name': name})
+
+    client = server.test_client()
+    for name in ['a', 'b', 'c']:
+        client.get(f'/api/item/{name}')
+    client.get('/missing')
+
+    report = metrics.report()['routes']
+    route = report['/api/item/<name>']
+    assert route['count'] == 3 and route['statuses'] == {'200': 3}
+    assert sum(route['latency_ms']['histogram'].values()) == 3
+    assert route['bytes']['total'] == sum(len(client.get(f'/api/item/{n}').data) for n in 'abc')
+    assert report['<unmatched>']['statuses'] == {'404': 1}
+
+    return report
+
+if __name__ == "__main__":
+    print("Running benchmark tooling tests...")
+    synthetic = test_synthetic_dataset()
+    report = test_request_metrics()
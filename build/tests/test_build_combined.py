@@ -0,0 +1,66 @@
+from utils.test_utils import run_test
+from utils.data_loader import write_columnar_cache, load_columnar_cache
+from ingest.build_combined import FeatureAccumulator, ModeAccumulator, AUDIO_FEATURES
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+def _synthetic_tracks(df, seed=0):
+    """Expand each country into a handful of noisy track rows"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _, country in df.iterrows():
+        n = int(rng.integers(2, 20))
+        tracks = pd.DataFrame({f: country[f] + rng.normal(0, 0.01, n) for f in AUDIO_FEATURES})
+        tracks['country'] = country['Country']
+        tracks['track_genre'] = rng.choice([country['track_genre'], 'pop'], n, p=[0.8, 0.2])
+        rows.append(tracks)
+    return pd.concat(rows).sample(frac=1, random_state=seed)
+
+@run_test
+def test_chunked_accumulators(df):
+    tracks = _synthetic_tracks(df)
+
+    # Fold two halves chunk by chunk into separate accumulators, then merge
+    halves = np.array_split(np.arange(len(tracks)), 2)
+    features, genres = FeatureAccumulator(AUDIO_FEATURES), ModeAccumulator()
+    for half in halves:
+        part_features, part_genres = FeatureAccumulator(AUDIO_FEATURES), ModeAccumulator()
+        for rows in np.array_split(half, 7):
+            chunk = tracks.iloc[rows]
+            part_features.update(chunk, 'country')
+            part_genres.update(chunk, 'country', 'track_genre')
+        features.merge(part_features)
+        genres.merge(part_genres)
+
+    expected = tracks.groupby('country')[AUDIO_FEATURES]
+    assert np.allclose(features.mean.loc[expected.mean().index], expected.mean())
+    assert np.allclose(features.std().loc[expected.std().index], expected.std())
+
+    expected_modes = tracks.groupby('country')['track_genre'].agg(lambda s: s.mode().iloc[0])
+    assert (genres.mode().loc[expected_modes.index] == expected_modes).all()
+
+    return features
+
+@run_test
+def test_columnar_cache_roundtrip(df):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        write_columnar_cache(df, cache_dir)
+        first = set(os.listdir(cache_dir))
+
+        # Rebuilding writes new column files and removes the previous ones
+        write_columnar_cache(df, cache_dir)
+        files = set(os.listdir(cache_dir))
+        assert first & files == {'manifest.json'}
+        assert not [name for name in files if name.endswith('.tmp')]
+
+        loaded = load_columnar_cache(cache_dir)
+        pd.testing.assert_frame_equal(loaded, df)
+
+    return loaded
+
+if __name__ == "__main__":
+    print("Running combined data builder tests...")
+    features = test_chunked_accumulators()
+    loaded = test_columnar_cache_roundtrip()
@@ -0,0 +1,49 @@
+from utils.test_utils import run_test
+from analysis.comparative_engine import ComparativeEngine, COLUMN_GROUPS
+from scipy import stats
+import numpy as np
+
+@run_test
+def test_matches_percentileofscore(df):
+    engine = ComparativeEngine(df)
+    for country in df['Country']:
+        row = df[df['Country'] == country].iloc[0]
+        region = df[df['region'] == row['region']]
+        position = engine.position(country)
+        for col in engine.columns:
+            expected = [
+                stats.percentileofscore(df[col].dropna(), row[col]),
+                stats.percentileofscore(region[col].dropna(), row[col]),
+                (row[col] - region[col].mean()) / region[col].std()
+            ]
+            actual = position.loc[col, ['global_percentile', 'region_percentile', 'region_zscore']]
+            assert np.allclose(actual, expected, equal_nan=True), (country, col)
+
+    return position
+
+@run_test
+def test_country_profile(df):
+    engine = ComparativeEngine(df)
+    profile = engine.profile('Singapore', ['music', 'cultural'])
+    assert profile['region'] == 'Asia' and list(profile['groups']) == ['music', 'cultural']
+
+    tempo = profile['groups']['music']['tempo']
+    assert tempo['global_count'] == len(df) and tempo['region_count'] == (df['region'] == 'Asia').sum()
+    assert np.isclose(tempo['global_median'], df['tempo'].median())
+
+    # Every country's percentiles come from the same precomputed table
+    percentiles = engine.table('global_percentile')
+    assert list(percentiles.index) == list(df['Country'])
+    assert percentiles.at['Singapore', 'tempo'] == tempo['global_percentile']
+
+    print("\nSingapore music percentiles (global / Asia):")
+    for feature in COLUMN_GROUPS['music']:
+        values = profile['groups']['music'][feature]
+        print(f"{feature}: {values['global_percentile']:.1f}% / {values['region_percentile']:.1f}%")
+
+    return profile
+
+if __name__ == "__main__":
+    print("Running comparative engine tests...")
+    position = test_matches_percentileofscore()
+    profile = test_country_profile()
@@ -0,0 +1,66 @@
+from utils.test_utils import run_test
+from analysis.correlation_engine import get_correlation_engine
+import numpy as np
+from scipy import stats
+
+@run_test
+def test_matches_pairwise_corr(df):
+    engine = get_correlation_engine(df)
+    features = ['tempo', 'energy', 'valence']
+    metrics = ['Life Ladder', 'Generosity', 'Average MHQ Score']
+    result = engine.correlate(features, metrics)
+
+    # Generosity has a missing value, so this also checks pairwise NaN handling
+    for feature in features:
+        for metric in metrics:
+            assert np.isclose(result['r'].at[feature, metric], df[feature].corr(df[metric]))
+
+    pair = df[['energy', 'Generosity']].dropna()
+    r, p = stats.pearsonr(pair['energy'], pair['Generosity'])
+    assert np.isclose(result['p'].at['energy', 'Generosity'], p)
+    assert result['n'].at['energy', 'Generosity'] == len(pair)
+
+    # Results are memoized and the engine is shared per DataFrame
+    assert engine.correlate(features, metrics) is result
+    assert get_correlation_engine(df) is engine
+
+    return result
+
+@run_test
+def test_grouped_correlations(df):
+    engine = get_correlation_engine(df)
+    by_region = engine.correlate(['valence'], ['Average MHQ Score'], group_by='region')
+
+    asia = df[df['region'] == 'Asia']
+    expected = asia['valence'].corr(asia['Average MHQ Score'])
+    assert np.isclose(by_region['Asia']['r'].at['valence', 'Average MHQ Score'], expected)
+
+    print("\nValence vs MHQ by region:")
+    for region, result in by_region.items():
+        print(f"{region}: r={result['r'].iloc[0, 0]:.3f} (n={result['n'].iloc[0, 0]})")
+
+    return by_region
+
+@run_test
+def test_spearman_and_categories(df):
+    engine = get_correlation_engine(df)
+    features = ['tempo', 'Generosity', 'Log GDP per capita']
+    metrics = ['Life Ladder', 'Perceptions of corruption']
+    spearman = engine.correlate(features, metrics, method='spearman')
+
+    # Columns with different missing rows are ranked within each pair's complete rows
+    for feature in features:
+        for metric in metrics:
+            expected = df[feature].corr(df[metric], method='spearman')
+            assert np.isclose(spearman['r'].at[feature, metric], expected), (feature, metric)
+
+    genres = engine.correlate_categories('track_genre', ['Average MHQ Score'])
+    assert set(genres['r'].index) == set(df['track_genre'].unique())
+
+    return genres
+
+if __name__ == "__main__":
+    print("Running correlation engine tests...")
+    pairwise = test_matches_pairwise_corr()
+    grouped = test_grouped_correlations()
+    categories = test_spearman_and_categories()
@@ -0,0 +1,38 @@
+from utils.test_utils import run_test
+from utils import payload
+import gzip
+import numpy as np
+
+@run_test
+def test_columns_table(df):
+    cols = ['Country', 'region', 'tempo', 'Average MHQ Score']
+    table = payload.columns_table(df, cols, decimals=2)
+
+    # Each column is sent once, in row order
+    assert list(table) == cols
+    assert len(table['Country']) == len(df)
+    assert table['Average MHQ Score'][0] == round(df['Average MHQ Score'].iloc[0], 2)
+
+    return table
+
+@run_test
+def test_encodings(df):
+    table = payload.columns_table(df, ['Country', 'energy'])
+    body = {'columns': table, 'pair': {'x': 'energy'}}
+
+    raw = b'{"columns": {}}' * 100
+    assert gzip.decompress(payload.compress(raw, 'gzip')) == raw
+    assert payload.compress(raw, None) == raw
+
+    if payload.MSGPACK in payload.available_mimetypes():
+        decoded = payload.msgpack.unpackb(payload.encode(body, payload.MSGPACK))
+        energy = np.frombuffer(decoded['columns']['energy']['data'], '<f4')
+        assert np.allclose(energy, df['energy'], rtol=1e-6)
+        assert decoded['columns']['Country'] == table['Country']
+
+    return body
+
+if __name__ == "__main__":
+    print("Running payload encoding tests...")
+    table = test_columns_table()
+    body = test_encodings()
@@ -0,0 +1,47 @@
+from utils.test_utils import run_test
+from utils.snapshot import DataSnapshot
+from analysis.registry import AnalyzerRegistry, ANALYZERS
+import os
+import tempfile
+
+@run_test
+def test_lazy_construction(df):
+    registry = AnalyzerRegistry(df, DataSnapshot(df).version, cache_dir=None)
+    assert not registry._analyzers
+
+    analyzer = registry.get('cross_regional')
+    assert type(analyzer).__name__ == 'CrossRegionalAnalyzer'
+    assert registry.get('cross_regional') is analyzer
+    assert list(registry._analyzers) == ['cross_regional']
+
+    return analyzer
+
+@run_test
+def test_persistent_results(df):
+    version = DataSnapshot(df).version
+    with tempfile.TemporaryDirectory() as cache_dir:
+        registry = AnalyzerRegistry(df, version, cache_dir=cache_dir)
+        result = registry.result('music_patterns', 'get_feature_distributions')
+        assert os.path.exists(registry.cache_path('music_patterns', 'get_feature_distributions'))
+
+        # A fresh registry serves the persisted result without building the analyzer
+        fresh = AnalyzerRegistry(df, version, cache_dir=cache_dir)
+        assert fresh.result('music_patterns', 'get_feature_distributions') == result
+        assert not fresh._analyzers
+
+        # Another dataset version or analyzer version misses the cache
+        other = AnalyzerRegistry(df, 'f' * 40, cache_dir=cache_dir)
+        assert not os.path.exists(other.cache_path('music_patterns', 'get_feature_distributions'))
+        path = registry.cache_path('music_patterns', 'get_feature_distributions')
+        ANALYZERS['music_patterns']['version'] += 1
+        try:
+            assert registry.cache_path('music_patterns', 'get_feature_distributions') != path
+        finally:
+            ANALYZERS['music_patterns']['version'] -= 1
+
+    return result
+
+if __name__ == "__main__":
+    print("Running analyzer registry tests...")
+    analyzer = test_lazy_construction()
+    result = test_persistent_results()
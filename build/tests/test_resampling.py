@@ -0,0 +1,51 @@
+from utils.test_utils import run_test
+from analysis.resampling import ResamplingEngine
+from scipy import stats
+import os
+import tempfile
+import numpy as np
+
+FEATURES = ['tempo', 'energy', 'valence']
+METRICS = ['Average MHQ Score', 'Life Ladder']
+
+@run_test
+def test_resampled_statistics(df):
+    engine = ResamplingEngine(df, n_resamples=2000, batch_size=300, cache_dir=None)
+
+    result = engine.correlate(FEATURES, METRICS)
+    for feature in FEATURES:
+        for metric in METRICS:
+            r = stats.pearsonr(df[feature], df[metric])[0]
+            assert np.isclose(result['r'].at[feature, metric], r)
+            assert result['ci_low'].at[feature, metric] <= r <= result['ci_high'].at[feature, metric]
+            assert 0 < result['p_perm'].at[feature, metric] <= 1
+
+    anova = engine.anova(FEATURES, 'region')
+    for feature in FEATURES:
+        groups = [group[feature].values for _, group in df.groupby('region')]
+        assert np.isclose(anova.at[feature, 'f_statistic'], stats.f_oneway(*groups)[0])
+
+    return anova
+
+@run_test
+def test_deterministic_and_persisted(df):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        serial = ResamplingEngine(df, n_resamples=1000, batch_size=250, cache_dir=cache_dir)
+        pooled = ResamplingEngine(df, n_resamples=1000, batch_size=250, workers=2,
+                                  cache_dir=None)
+        expected = serial.correlate(FEATURES, METRICS)
+        for name, frame in pooled.correlate(FEATURES, METRICS).items():
+            assert frame.equals(expected[name]), name
+
+        # A fresh engine on the same data reads the persisted result
+        assert len(os.listdir(cache_dir)) == 1
+        reloaded = ResamplingEngine(df, n_resamples=1000, batch_size=250, cache_dir=cache_dir)
+        reloaded._resample = None
+        assert reloaded.correlate(FEATURES, METRICS)['ci_low'].equals(expected['ci_low'])
+
+    return expected
+
+if __name__ == "__main__":
+    print("Running resampling engine tests...")
+    anova = test_resampled_statistics()
+    expected = test_deterministic_and_persisted()
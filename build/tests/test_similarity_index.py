@@ -0,0 +1,80 @@
+from utils.test_utils import run_test
+from analysis.similarity_index import SimilarityIndex, get_similarity_index, PROFILES
+from scipy.spatial.distance import cdist
+import numpy as np
+
+def _standardized(df, profile):
+    features = df[PROFILES[profile]]
+    return ((features - features.mean()) / features.std()).fillna(0).to_numpy()
+
+@run_test
+def test_matches_brute_force(df):
+    countries = df['Country'].tolist()
+    singapore = countries.index('Singapore')
+    music, combined = _standardized(df, 'music'), _standardized(df, 'combined')
+    cases = {
+        ('combined', 'euclidean'): cdist(combined, combined, 'euclidean'),
+        ('combined', 'cosine'): cdist(combined, combined, 'cosine'),
+        ('music', 'mahalanobis'): cdist(music, music, 'mahalanobis',
+                                        VI=np.linalg.inv(np.cov(music, rowvar=False))),
+    }
+
+    for (profile, metric), distances in cases.items():
+        index = get_similarity_index(df, profile, metric)
+        neighbors = index.kneighbors(['Singapore'], 5)['Singapore']
+
+        expected = [i for i in np.argsort(distances[singapore]) if i != singapore][:5]
+        assert list(neighbors) == [countries[i] for i in expected], metric
+        assert np.allclose(list(neighbors.values()), distances[singapore, expected]), metric
+
+    return neighbors
+
+@run_test
+def test_tree_matches_matrix(df):
+    columns = PROFILES['music']
+    matrix = SimilarityIndex(df, columns, metric='weighted', weights={'tempo': 4.0})
+    tree = SimilarityIndex(df, columns, metric='weighted', weights={'tempo': 4.0},
+                           brute_force_limit=0)
+    assert matrix.tree is None and tree.tree is not None
+
+    countries = df['Country'].tolist()
+    for a, b in zip(matrix.kneighbors(countries, 7).values(),
+                    tree.kneighbors(countries, 7).values()):
+        assert list(a) == list(b)
+        assert np.allclose(list(a.values()), list(b.values()))
+
+    # A country's own raw profile is its nearest neighbour at distance zero
+    singapore = df.loc[df['Country'] == 'Singapore', columns].iloc[0].to_dict()
+    hits = tree.query([singapore], 3)[0]
+    assert next(iter(hits)) == 'Singapore' and np.isclose(hits['Singapore'], 0)
+
+    return hits
+
+@run_test
+def test_rejects_invalid_input(df):
+    columns = PROFILES['music']
+    index = SimilarityIndex(df, columns)
+    calls = [
+        lambda: SimilarityIndex(df, columns, metric='weighted', weights={'energy': -1.0}),
+        lambda: SimilarityIndex(df, columns, metric='weighted', weights={'energy': float('inf')}),
+        lambda: index.query([{'tempo': float('inf')}]),
+        lambda: index.query([{'tempo': float('nan')}]),
+        lambda: index.kneighbors(['Singapore'], 0),
+        lambda: index.query([{'tempo': 120.0}], -1),
+    ]
+
+    errors = []
+    for call in calls:
+        try:
+            call()
+        except ValueError as e:
+            errors.append(str(e))
+    assert len(errors) == len(calls), errors
+
+    return errors
+
+if __name__ == "__main__":
+    print("Running similarity index tests...")
+    neighbors = test_matches_brute_force()
+    hits = test_tree_matches_matrix()
+    errors = test_rejects_invalid_input()
@@ -0,0 +1,42 @@
+from utils.test_utils import run_test
+from utils.snapshot import DataSnapshot, MAX_RESPONSES
+
+@run_test
+def test_snapshot_ranks(df):
+    snapshot = DataSnapshot(df)
+
+    # Ranks should match a direct per-region computation
+    singapore = df[df['Country'] == 'Singapore'].iloc[0]
+    asia = df[df['region'] == singapore['region']]
+    expected_global = int(df['Average MHQ Score'].rank(ascending=False)[singapore.name])
+    expected_regional = int(asia['Life Ladder'].rank(ascending=False)[singapore.name])
+
+    assert len(snapshot.country_index) == df['Country'].nunique()
+    assert snapshot.global_rank('Average MHQ Score', 'Singapore') == expected_global
+    assert snapshot.regional_rank('Life Ladder', 'Singapore') == expected_regional
+    assert snapshot.region_sizes['Asia'] == len(df[df['region'] == 'Asia'])
+
+    return snapshot
+
+@run_test
+def test_snapshot_response_cache(df):
+    snapshot = DataSnapshot(df)
+
+    assert snapshot.get_response('/api/countries?') is None
+    body, etag, headers = snapshot.store_response('/api/countries?', b'{}')
+    assert snapshot.get_response('/api/countries?') == (body, etag, headers)
+
+    # Least recently used responses are evicted past MAX_RESPONSES
+    for i in range(MAX_RESPONSES):
+        snapshot.store_response(f'/api/similar?k={i}', b'{}')
+        snapshot.get_response('/api/countries?')
+    assert snapshot.get_response('/api/countries?') is not None
+    assert snapshot.get_response('/api/similar?k=0') is None
+    assert len(snapshot._responses) == MAX_RESPONSES
+
+    return etag
+
+if __name__ == "__main__":
+    print("Running data snapshot tests...")
+    snapshot = test_snapshot_ranks()
+    etag = test_snapshot_response_cache()
@@ -0,0 +1,25 @@
+import json
+import os
+import threading
+import pandas as pd
+from typing import Callable
+
+def replace_atomically(path: str, write: Callable[[str], None]) -> None:
+    """Write a file via a temporary path so concurrent readers never see a partial file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def write_json(path: str, result, **options) -> None:
+    """Atomically write a JSON file"""
+    def write(temp_path: str) -> None:
+        with open(temp_path, 'w') as f:
+            json.dump(result, f, **options)
+    replace_atomically(path, write)
+
+
+def write_pickle(path: str, result) -> None:
+    """Atomically pickle a result"""
+    replace_atomically(path, lambda temp_path: pd.to_pickle(result, temp_path))
@@ -0,0 +1,97 @@
+import json
+import os
+import uuid
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from utils.atomic import write_json
+
+DEFAULT_DATA_PATH = 'data/combined_data.csv'
+MANIFEST = 'manifest.json'
+
+
+def cache_dir_for(csv_path: str) -> str:
+    """Columnar cache directory that sits next to a CSV"""
+    return os.path.splitext(csv_path)[0] + '_columns'
+
+
+def write_columnar_cache(df: pd.DataFrame, cache_dir: str,
+                         source_path: Optional[str] = None) -> None:
+    """Write one .npy file per column so the data loads without parsing.
+
+    Text columns are stored as fixed-width unicode arrays, with a mask file
+    when they contain missing values. When source_path is given, its size and
+    mtime are recorded so stale caches are ignored. Column files are named
+    per write and the manifest is replaced last, so a worker loading during a
+    rebuild reads either the previous cache or the new one.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    build = uuid.uuid4().hex[:12]
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        entry = {'name': str(col), 'file': f'{build}.{i}.npy'}
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            np.save(os.path.join(cache_dir, entry['file']), values.to_numpy())
+            entry['kind'] = 'numeric'
+        else:
+            missing = values.isna().to_numpy()
+            text = values.astype(object).where(~missing, '').astype(str).to_numpy(dtype=str)
+            np.save(os.path.join(cache_dir, entry['file']), text)
+            entry['kind'] = 'text'
+            if missing.any():
+                entry['mask'] = f'{build}.{i}.mask.npy'
+                np.save(os.path.join(cache_dir, entry['mask']), missing)
+        columns.append(entry)
+
+    manifest = {'rows': len(df), 'columns': columns}
+    if source_path is not None:
+        manifest['source'] = _file_signature(source_path)
+    write_json(os.path.join(cache_dir, MANIFEST), manifest, indent=2)
+
+    # Drop the previous cache's files
+    current = {entry[key] for entry in columns for key in ('file', 'mask') if key in entry}
+    for name in os.listdir(cache_dir):
+        if name.endswith('.npy') and name not in current:
+            os.remove(os.path.join(cache_dir, name))
+
+
+def load_columnar_cache(cache_dir: str) -> pd.DataFrame:
+    """Load a columnar cache; arrays are read straight from disk, nothing is parsed"""
+    with open(os.path.join(cache_dir, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(os.path.join(cache_dir, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'numeric':
+            data[entry['name']] = values
+        else:
+            text = values.astype(object)
+            if 'mask' in entry:
+                text[np.load(os.path.join(cache_dir, entry['mask']))] = np.nan
+            # Let pandas infer the same string dtype read_csv would use
+            data[entry['name']] = pd.Series(text.tolist())
+    return pd.DataFrame(data)
+
+
+def load_data(csv_path: str = DEFAULT_DATA_PATH) -> pd.DataFrame:
+    """Load the combined dataset, preferring a fresh columnar cache over the CSV"""
+    cache_dir = cache_dir_for(csv_path)
+    manifest_path = os.path.join(cache_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            source = json.load(f).get('source')
+        if source is not None and source == _file_signature(csv_path):
+            try:
+                return load_columnar_cache(cache_dir)
+            except (OSError, ValueError):
+                # Column files were replaced by a rebuild while loading
+                pass
+    return pd.read_csv(csv_path)
+
+
+def _file_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
@@ -0,0 +1,22 @@
+import weakref
+import pandas as pd
+from typing import Callable, TypeVar
+
+Engine = TypeVar('Engine')
+
+# Held weakly: an engine lives as long as some analyzer or route keeps it
+_engines = weakref.WeakValueDictionary()
+
+def shared_engine(name: str, df: pd.DataFrame, factory: Callable[[pd.DataFrame], Engine]) -> Engine:
+    """Get the engine called name for a DataFrame, building it with factory on first use.
+
+    Engines are shared per name and DataFrame so analyzers reading the same
+    frame reuse each other's results. The engine's df is checked since a
+    collected frame's id can be reused.
+    """
+    key = (name, id(df))
+    engine = _engines.get(key)
+    if engine is None or engine.df is not df:
+        engine = factory(df)
+        _engines[key] = engine
+    return engine
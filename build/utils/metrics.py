@@ -0,0 +1,91 @@
+import threading
+import time
+from flask import Flask, g, request
+from typing import Dict
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class RequestMetrics:
+    """Opt-in per-route request counts, latency histograms and payload sizes.
+
+    Routes are keyed by their URL rule (e.g. /api/analysis/<analyzer>/<method>)
+    so parameterized routes aggregate into one entry.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._routes: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, server: Flask) -> None:
+        """Time every request handled by a Flask server"""
+        server.before_request(self._start_timer)
+        server.after_request(self._record)
+
+    def _start_timer(self) -> None:
+        g.request_started = time.perf_counter()
+
+    def _record(self, response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        size = response.calculate_content_length() or 0
+
+        with self._lock:
+            stats = self._routes.setdefault(route, _empty_stats())
+            stats['count'] += 1
+            stats['statuses'][str(response.status_code)] = (
+                stats['statuses'].get(str(response.status_code), 0) + 1
+            )
+            stats['latency_ms']['sum'] += elapsed_ms
+            stats['latency_ms']['max'] = max(stats['latency_ms']['max'], elapsed_ms)
+            stats['latency_ms']['histogram'][_bucket(elapsed_ms)] += 1
+            stats['bytes']['sum'] += size
+            stats['bytes']['max'] = max(stats['bytes']['max'], size)
+        return response
+
+    def report(self) -> Dict:
+        """Copy of the collected metrics with per-route means"""
+        with self._lock:
+            routes = {}
+            for route, stats in self._routes.items():
+                latency, size = stats['latency_ms'], stats['bytes']
+                routes[route] = {
+                    'count': stats['count'],
+                    'statuses': dict(stats['statuses']),
+                    'latency_ms': {
+                        'mean': latency['sum'] / stats['count'],
+                        'max': latency['max'],
+                        'histogram': dict(latency['histogram'])
+                    },
+                    'bytes': {
+                        'mean': size['sum'] / stats['count'],
+                        'max': size['max'],
+                        'total': size['sum']
+                    }
+                }
+        return {'uptime_seconds': time.time() - self.started, 'routes': routes}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+def _bucket(elapsed_ms: float) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if elapsed_ms <= bound:
+            return f'le_{bound}'
+    return f'gt_{LATENCY_BUCKETS_MS[-1]}'
+
+
+def _empty_stats() -> Dict:
+    buckets = [f'le_{bound}' for bound in LATENCY_BUCKETS_MS] + [f'gt_{LATENCY_BUCKETS_MS[-1]}']
+    return {
+        'count': 0,
+        'statuses': {},
+        'latency_ms': {'sum': 0.0, 'max': 0.0, 'histogram': dict.fromkeys(buckets, 0)},
+        'bytes': {'sum': 0, 'max': 0}
+    }
@@ -0,0 +1,115 @@
+import gzip
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+# Optional encoders, not in requirements.txt: install msgpack, pyarrow and
+# brotli to offer MessagePack, Arrow IPC and Brotli. Formats whose package is
+# missing are simply not offered, so clients fall back to JSON and gzip.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+ARROW = 'application/vnd.apache.arrow.stream'
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+def available_mimetypes() -> List[str]:
+    """Response encodings this install can produce, JSON first"""
+    mimetypes = [JSON]
+    if msgpack is not None:
+        mimetypes.append(MSGPACK)
+    if pa is not None:
+        mimetypes.append(ARROW)
+    return mimetypes
+
+
+def available_encodings() -> List[str]:
+    """Content encodings this install can produce, preferred first"""
+    return (['br'] if brotli is not None else []) + ['gzip']
+
+
+def columns_table(frame: pd.DataFrame, cols: List[str],
+                  decimals: Optional[int] = None) -> Dict[str, list]:
+    """Columnar table where each column is sent once as a list"""
+    table = frame[cols]
+    if decimals is not None:
+        numeric = table.select_dtypes('number').columns
+        table = table.astype({col: float for col in numeric}).round(
+            {col: decimals for col in numeric}
+        )
+    return {str(col): table[col].tolist() for col in cols}
+
+
+def encode(payload: Dict, mimetype: str) -> bytes:
+    """Serialize a payload as MessagePack or Arrow IPC.
+
+    Numeric columns of a columnar payload ('columns' key) are sent as
+    little-endian float32 arrays.
+    """
+    if mimetype == MSGPACK:
+        return msgpack.packb(_typed_columns(payload), use_bin_type=True)
+    if mimetype == ARROW:
+        return _encode_arrow(payload)
+    raise ValueError(f"Unsupported payload encoding: {mimetype}")
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Compress a response body with the negotiated content encoding"""
+    if encoding == 'br':
+        return brotli.compress(body)
+    if encoding == 'gzip':
+        return gzip.compress(body)
+    return body
+
+
+def _float32_columns(columns: Dict[str, list]) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for name, values in columns.items():
+        array = np.asarray(values)
+        if array.dtype.kind in 'fiu':
+            array = array.astype('<f4')
+        arrays[name] = array
+    return arrays
+
+
+def _typed_columns(payload: Dict) -> Dict:
+    if 'columns' not in payload:
+        return payload
+
+    columns = {}
+    for name, array in _float32_columns(payload['columns']).items():
+        if array.dtype == np.dtype('<f4'):
+            columns[name] = {'dtype': 'float32', 'data': array.tobytes()}
+        else:
+            columns[name] = array.tolist()
+    return {**payload, 'columns': columns}
+
+
+def _encode_arrow(payload: Dict) -> bytes:
+    """Arrow IPC stream of the columns table, with the rest of the payload as JSON metadata"""
+    arrays = _float32_columns(payload.get('columns', {}))
+    table = pa.table({name: pa.array(array) for name, array in arrays.items()})
+    metadata = {k: v for k, v in payload.items() if k != 'columns'}
+    table = table.replace_schema_metadata({'payload': json.dumps(metadata)})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
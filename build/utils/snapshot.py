@@ -0,0 +1,83 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Response bodies are cached per route and query args; only the most
+# recently used MAX_RESPONSES are kept.
+MAX_RESPONSES = 512
+
+class DataSnapshot:
+    """Per-load view of the dataset with lookups the API reuses on every request"""
+
+    rank_columns = ['Average MHQ Score', 'Life Ladder']
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+        # First row per country, in the order countries appear in the data
+        self.countries = df.drop_duplicates('Country')
+        self.country_index = dict(zip(self.countries['Country'], self.countries.index))
+
+        # Rankings computed once for the whole frame instead of per country
+        self.global_ranks = df[self.rank_columns].rank(ascending=False)
+        self.regional_ranks = df.groupby('region')[self.rank_columns].rank(ascending=False)
+
+        # Per-region group statistics
+        numeric_cols = df.select_dtypes('number').columns
+        region_groups = df.groupby('region', sort=False)
+        # Reduce each region frame directly so means match Series.mean exactly
+        self.region_means = pd.DataFrame({
+            region: group[numeric_cols].mean()
+            for region, group in region_groups
+        }).T
+        self.region_sizes = region_groups.size()
+        self.region_genre_modes = region_groups['track_genre'].agg(
+            lambda genres: genres.mode().iloc[0]
+        )
+
+        self.version = hashlib.sha1(
+            pd.util.hash_pandas_object(df, index=True).values.tobytes()
+        ).hexdigest()
+
+        self._responses: 'OrderedDict[str, Tuple[bytes, str, Dict[str, str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def country_row(self, country: str) -> pd.Series:
+        """Get the data row for a country"""
+        return self.df.loc[self.country_index[country]]
+
+    def global_rank(self, column: str, country: str) -> int:
+        """Get a country's global rank for a ranked column"""
+        return int(self.global_ranks.at[self.country_index[country], column])
+
+    def regional_rank(self, column: str, country: str) -> int:
+        """Get a country's rank within its region for a ranked column"""
+        return int(self.regional_ranks.at[self.country_index[country], column])
+
+    def get_response(self, key: str) -> Optional[Tuple[bytes, str, Dict[str, str]]]:
+        """Get a cached response body, its ETag and headers, if one has been stored"""
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None:
+                self._responses.move_to_end(key)
+            return cached
+
+    def store_response(self, key: Optional[str], body: bytes,
+                       headers: Optional[Dict[str, str]] = None) -> Tuple[bytes, str, Dict[str, str]]:
+        """Cache a serialized response body under its ETag (with no key, just tag it)"""
+        entry = (body, hashlib.sha1(body).hexdigest(), headers or {})
+        if key is None:
+            return entry
+        with self._lock:
+            entry = self._responses.setdefault(key, entry)
+            self._responses.move_to_end(key)
+            while len(self._responses) > MAX_RESPONSES:
+                self._responses.popitem(last=False)
+            return entry
+
+    def clear_responses(self) -> None:
+        """Drop cached response bodies"""
+        with self._lock:
+            self._responses.clear()
@@ -1,10 +1,10 @@
-import pandas as pd
 import numpy as np
+from utils.data_loader import load_data
 
 def load_test_data():
     """Load the actual data for testing"""
     try:
-        return pd.read_csv('data/combined_data.csv')
+        return load_data('data/combined_data.csv')
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
@@ -1,34 +1,66 @@
 import graphviz
 from typing import Dict, List
 
+from analysis.pipeline import Pipeline, resolve_columns
+
+# Data sources by node id, with their label and the column groups they provide
+SOURCES = {
+    'happiness_data': ('World Happiness Report', ['happiness', 'cultural']),
+    'mental_data': ('Mental State Report', ['age', 'employment', 'education',
+                                            'wellbeing_categories', 'mhq_scores']),
+    'music_data': ('Spotify Features', ['music', 'track_genre'])
+}
+
+STAGES = {
+    'foundation': 'Foundation Analysis',
+    'relationships': 'Core Relationships',
+    'regional': 'Regional Analysis',
+    'singapore_focus': 'Singapore Focus',
+    'validation': 'Validation'
+}
+
 class AnalysisFlowVisualizer:
-    def __init__(self):
+    def __init__(self, pipeline: Pipeline):
+        self.pipeline = pipeline
         self.dot = graphviz.Digraph(comment='Analysis Data Flow')
         self.dot.attr(rankdir='LR')
 
     def generate_flow_diagram(self) -> None:
-        """Generate complete analysis flow diagram"""
+        """Draw the pipeline graph, with each node's runtime from the last run"""
         # Data sources
         self.dot.node('data_sources', 'Data Sources')
-        self.dot.node('happiness_data', 'World Happiness Report')
-        self.dot.node('mental_data', 'Mental State Report')
-        self.dot.node('music_data', 'Spotify Features')
-
-        # Analysis components
-        self.dot.node('foundation', 'Foundation Analysis')
-        self.dot.node('relationships', 'Core Relationships')
-        self.dot.node('singapore', 'Singapore Focus')
-        self.dot.node('recommendations', 'Recommendations')
-
-        # Connect nodes
-        for source in ['happiness_data', 'mental_data', 'music_data']:
+        for source, (label, _) in SOURCES.items():
+            self.dot.node(source, label)
             self.dot.edge('data_sources', source)
-            self.dot.edge(source, 'foundation')
-        
-        self.dot.edge('foundation', 'relationships')
-        self.dot.edge('relationships', 'singapore')
-        self.dot.edge('singapore', 'recommendations')
+
+        # Pipeline nodes, grouped by stage
+        stages: Dict[str, List[str]] = {}
+        for node in self.pipeline.nodes.values():
+            stages.setdefault(node.stage, []).append(node.name)
+        for stage, names in stages.items():
+            with self.dot.subgraph(name=f'cluster_{stage}') as cluster:
+                cluster.attr(label=STAGES.get(stage, str(stage)))
+                for name in names:
+                    cluster.node(name, self._label(name))
+
+        # Connect sources to the nodes reading their columns, and nodes to their upstream
+        for source, (_, groups) in SOURCES.items():
+            columns = set(resolve_columns(groups))
+            for node in self.pipeline.nodes.values():
+                if columns & set(node.columns):
+                    self.dot.edge(source, node.name)
+        for upstream, downstream in self.pipeline.edges():
+            self.dot.edge(upstream, downstream)
+
+    def _label(self, name: str) -> str:
+        """Node name with its measured runtime, or whether it was reused or not run"""
+        timing = self.pipeline.timings.get(name)
+        if timing is None:
+            return f'{name}\\nnot run'
+        if timing['cached']:
+            return f'{name}\\ncached'
+        return f"{name}\\n{timing['seconds']:.2f}s"
 
     def save_diagram(self, filename: str = 'analysis_flow') -> None:
         """Save the flow diagram"""
-        self.dot.render(filename, view=True) 
\ No newline at end of file
+        self.dot.render(filename, view=True)
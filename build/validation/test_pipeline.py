@@ -1,56 +1,83 @@
+import argparse
 import pandas as pd
+from typing import Dict, Optional
 from validation.analysis_validator import AnalysisValidator
 from validation.flow_visualizer import AnalysisFlowVisualizer
 from validation.error_handler import AnalysisErrorHandler
-from analysis.singapore_focus.recommendations import RecommendationEngine
+from analysis.pipeline import DEFAULT_CACHE_DIR, EXECUTORS, Node, Pipeline, analyzer_pipeline
+from utils.data_loader import load_data
 
-def run_validation_pipeline():
+RECOMMENDATIONS = 'recommendations.generate_recommendations'
+
+def validate_data(frame: pd.DataFrame, upstream: Dict) -> Dict:
+    """Validate data structure"""
+    return AnalysisValidator(frame).validate_data_consistency()
+
+def validate_outputs(frame: pd.DataFrame, upstream: Dict) -> Dict:
+    """Validate the recommendation output structure"""
+    validator = AnalysisValidator(frame)
+    recommendations = upstream[RECOMMENDATIONS]
+    return {
+        'music_recommendations': validator.validate_output_structure(
+            recommendations['music_interventions'],
+            'music_recommendations'
+        ),
+        'implementation': validator.validate_output_structure(
+            recommendations['implementation_strategy'],
+            'implementation_strategy'
+        )
+    }
+
+def build_pipeline(**options) -> Pipeline:
+    """Every analyzer method plus the validation steps"""
+    pipeline = analyzer_pipeline(**options)
+    pipeline.add(Node(
+        'data_validation', validate_data, stage='validation',
+        columns=['Country', 'region', 'Average MHQ Score', 'Life Ladder', 'music',
+                 'age', 'employment', 'education']
+    ))
+    pipeline.add(Node(
+        'output_validation', validate_outputs, columns=['Country', 'region'],
+        upstream=[RECOMMENDATIONS], stage='validation'
+    ))
+    return pipeline
+
+def run_validation_pipeline(workers: Optional[int] = None, executor: str = 'thread',
+                            cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
     # Initialize error handler
     error_handler = AnalysisErrorHandler()
-    
+
     @error_handler.handle_errors
     def execute_validation():
         # 1. Load Data
-        df = pd.read_csv('data/combined_data.csv')
-        
-        # 2. Initialize Validator
-        validator = AnalysisValidator(df)
-        
-        # 3. Initialize RecommendationEngine
-        engine = RecommendationEngine(df)
-        
-        # 4. Validate Data Structure
-        data_validation = validator.validate_data_consistency()
-        print("Data Validation Results:", data_validation)
-        
-        # 5. Generate and Validate Recommendations
-        recommendations = engine.generate_recommendations()
-        
-        # 6. Validate Output Structure
-        output_validations = {
-            'music_recommendations': validator.validate_output_structure(
-                recommendations['music_interventions'], 
-                'music_recommendations'
-            ),
-            'implementation': validator.validate_output_structure(
-                recommendations['implementation_strategy'], 
-                'implementation_strategy'
-            )
-        }
-        print("Output Structure Validation:", output_validations)
-        
-        # 7. Generate Flow Diagram
-        visualizer = AnalysisFlowVisualizer()
+        df = load_data('data/combined_data.csv')
+
+        # 2. Run every analysis and validation concurrently, reusing
+        # results whose input columns have not changed since the last run
+        pipeline = build_pipeline(workers=workers, executor=executor, cache_dir=cache_dir)
+        results = pipeline.run(df)
+        print("Data Validation Results:", results['data_validation'])
+        print("Output Structure Validation:", results['output_validation'])
+
+        # 3. Generate Flow Diagram with measured runtimes
+        visualizer = AnalysisFlowVisualizer(pipeline)
         visualizer.generate_flow_diagram()
         visualizer.save_diagram('analysis_flow')
-        
+
         return {
-            'data_validation': data_validation,
-            'output_validation': output_validations,
-            'recommendations': recommendations
+            'data_validation': results['data_validation'],
+            'output_validation': results['output_validation'],
+            'recommendations': results[RECOMMENDATIONS]
         }
-    
+
     return execute_validation()
 
 if __name__ == "__main__":
-    results = run_validation_pipeline() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description='Run and validate every analysis, then draw the analysis flow diagram'
+    )
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--executor', choices=sorted(EXECUTORS), default='thread')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    options = parser.parse_args()
+    results = run_validation_pipeline(options.workers, options.executor, options.cache_dir)